@@ -1,12 +1,17 @@
 import streamlit as st
-import re
 import os
 import tempfile
-import zipfile
 import base64
 from pathlib import Path
 from TTS.api import TTS
 import time
+import uuid
+import numpy as np
+
+from archive import stream_zip
+from artifacts import ArtifactRegistry, ArtifactStore
+from encoding import OUTPUT_FORMATS, encode_to_file, encoder_pool, file_extension, media_type_for
+from segmentation import char_limit, plan_chunks
 
 # Configure Streamlit page
 st.set_page_config(
@@ -431,6 +436,19 @@ if not st.session_state.model_loaded:
     if st.session_state.tts_model:
         st.session_state.model_loaded = True
 
+@st.cache_resource
+def get_artifact_store():
+    """Managed output directories with TTL and disk quota (one per process)"""
+    data_dir = os.getenv("DATA_DIR") or os.path.join(tempfile.gettempdir(), "geria_voice_cloning_app")
+    store = ArtifactStore(
+        data_dir,
+        ArtifactRegistry(os.path.join(data_dir, "artifacts.db")),
+        ttl=float(os.getenv("ARTIFACT_TTL_HOURS", 24)) * 3600,
+        max_bytes=int(os.getenv("ARTIFACT_MAX_BYTES", 5 * 1024 ** 3))
+    )
+    store.start_janitor(interval=int(os.getenv("JANITOR_INTERVAL_S", 300)))
+    return store
+
 def get_logo_base64():
     """Convert logo to base64 for embedding"""
     try:
@@ -454,39 +472,8 @@ def get_logo_base64():
         print(f"Logo loading error: {e}")
         return ""
 
-def split_text(text, max_length=400):
-    """Split text into chunks"""
-    words = text.split()
-    chunks, current_chunk = [], []
-    current_length = 0
-
-    for word in words:
-        if current_length + len(word) + 1 <= max_length:
-            current_chunk.append(word)
-            current_length += len(word) + 1
-        else:
-            chunks.append(' '.join(current_chunk))
-            current_chunk = [word]
-            current_length = len(word) + 1
-
-    if current_chunk:
-        chunks.append(' '.join(current_chunk))
-
-    return chunks
-
-def extract_paragraphs(text):
-    """Extract paragraphs from text"""
-    # Try to extract numbered paragraphs first
-    paragraphs = re.findall(r"Paragraph\s+(\d+):\s*(.*?)(?=Paragraph\s+\d+:|$)", text, re.DOTALL)
-    
-    if not paragraphs:
-        # If no numbered paragraphs, split by double newlines
-        text_paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
-        paragraphs = [(i+1, p) for i, p in enumerate(text_paragraphs)]
-    
-    return paragraphs
-
-def process_voice_cloning(text, speaker_files, voice_mode, progress_bar=None, status_text=None):
+def process_voice_cloning(text, speaker_files, voice_mode, progress_bar=None, status_text=None,
+                          output_format="wav", bitrate=None):
     """Process voice cloning with progress tracking"""
     if not st.session_state.tts_model:
         st.session_state.tts_model = load_tts_model()
@@ -494,8 +481,10 @@ def process_voice_cloning(text, speaker_files, voice_mode, progress_bar=None, st
     if not st.session_state.tts_model:
         return None
     
-    # Create temporary directory for outputs
-    temp_dir = tempfile.mkdtemp()
+    # Create managed directory for outputs
+    artifact_store = get_artifact_store()
+    job_id = uuid.uuid4().hex
+    temp_dir = artifact_store.create_job_dir(job_id)
     output_files = []
     
     try:
@@ -507,68 +496,59 @@ def process_voice_cloning(text, speaker_files, voice_mode, progress_bar=None, st
                 f.write(speaker_file.getvalue())
             speaker_paths.append(speaker_path)
         
-        # Extract paragraphs
-        paragraphs = extract_paragraphs(text)
+        # Sentence-aligned chunks sized for the model's tokenizer
+        tts = st.session_state.tts_model
+        extension = file_extension(output_format)
+        planned = plan_chunks(text, char_limit("en", tts.synthesizer.tts_model), extension)
         
         # Progress tracking
         if progress_bar is None:
             progress_bar = st.progress(0)
         if status_text is None:
             status_text = st.empty()
-            
-        total_chunks = 0
-        
-        # Count total chunks
-        for para_num, para_text in paragraphs:
-            chunks = split_text(para_text.strip().replace('\n', ' '))
-            total_chunks += len(chunks)
         
+        total_chunks = len(planned)
         processed_chunks = 0
+        sample_rate = tts.synthesizer.output_sample_rate
+        encodes = []
         
-        # Process each paragraph
-        for para_num, para_text in paragraphs:
-            para_text = para_text.strip().replace('\n', ' ')
-            chunks = split_text(para_text)
+        # Process each chunk
+        for item in planned:
+            file_name = item["file_name"]
+            output_path = os.path.join(temp_dir, file_name)
             
-            for part_idx, chunk in enumerate(chunks, start=1):
-                if len(chunks) > 1:
-                    file_name = f"Paragraph_{para_num}_part_{part_idx}.wav"
-                else:
-                    file_name = f"Paragraph_{para_num}.wav"
-                
-                output_path = os.path.join(temp_dir, file_name)
-                
-                status_text.text(f"Processing Paragraph {para_num}, Part {part_idx}/{len(chunks)}...")
-                
-                # Generate audio
-                st.session_state.tts_model.tts_to_file(
-                    text=chunk,
-                    file_path=output_path,
-                    speaker_wav=speaker_paths,
-                    language="en",
-                    split_sentences=True
-                )
-                
-                output_files.append((file_name, output_path))
-                processed_chunks += 1
-                progress_bar.progress(processed_chunks / total_chunks)
-        
-        status_text.text("Creating download package...")
+            status_text.text(f"Processing Paragraph {item['paragraph']}, Part {item['part']}/{item['parts']}...")
+            
+            # Generate audio; encoding runs in the background while the next chunk is synthesized
+            wav = tts.tts(
+                text=item["text"],
+                speaker_wav=speaker_paths,
+                language="en",
+                split_sentences=False
+            )
+            encodes.append(encoder_pool.submit(
+                encode_to_file, output_path, np.asarray(wav, dtype=np.float32),
+                sample_rate, output_format, bitrate
+            ))
+            
+            output_files.append((file_name, output_path))
+            processed_chunks += 1
+            progress_bar.progress(processed_chunks / total_chunks)
         
-        # Create ZIP file
-        zip_path = os.path.join(temp_dir, "voice_cloning_output.zip")
-        with zipfile.ZipFile(zip_path, 'w') as zipf:
-            for file_name, file_path in output_files:
-                zipf.write(file_path, file_name)
+        sizes = [encode.result() for encode in encodes]
+        saved = sum(wav_bytes - encoded for encoded, wav_bytes in sizes)
         
         progress_bar.progress(1.0)
-        status_text.text("Processing complete")
+        status_text.text(f"Processing complete ({saved / 1024:.1f} KB saved vs WAV)")
         
-        return zip_path, output_files
+        return output_files
         
     except Exception as e:
         st.error(f"Error during processing: {str(e)}")
         return None
+    
+    finally:
+        artifact_store.finalize(job_id)
 
 # Main App
 def main():
@@ -675,6 +655,18 @@ def main():
     col3, col4, col5 = st.columns([1, 2, 1])
     
     with col4:
+        output_format = st.selectbox(
+            "Output Format",
+            ["wav", "flac", "opus", "mp3"],
+            format_func=str.upper,
+            help="FLAC is lossless; Opus and MP3 are much smaller"
+        )
+        bitrate = None
+        if OUTPUT_FORMATS[output_format]["kbps"]:
+            # Each codec's own range, so no setting is silently clamped
+            low, high = OUTPUT_FORMATS[output_format]["kbps"]
+            bitrate = st.slider("Bitrate (kbps)", low, high, 96)
+        
         if st.button("Start Voice Cloning", disabled=(st.session_state.processing or not st.session_state.model_loaded), use_container_width=True):
             if not speaker_files:
                 st.error("Please upload at least one voice sample.")
@@ -702,13 +694,13 @@ def main():
                         progress_bar = st.progress(0)
                         status_text = st.empty()
                     
-                    result = process_voice_cloning(text_content, speaker_files, voice_mode, progress_bar, status_text)
+                    result = process_voice_cloning(text_content, speaker_files, voice_mode, progress_bar, status_text, output_format, bitrate)
                     
                     # Clear loading screen
                     loading_placeholder.empty()
                     
                     if result:
-                        zip_path, output_files = result
+                        output_files = result
                         
                         # Display results in beautiful container
                         st.markdown("""
@@ -720,15 +712,15 @@ def main():
                         </div>
                         """, unsafe_allow_html=True)
                         
-                        # Download button
-                        with open(zip_path, "rb") as f:
-                            st.download_button(
-                                "📦 Download All Audio Files",
-                                f.read(),
-                                file_name="voice_cloning_output.zip",
-                                mime="application/zip",
-                                use_container_width=True
-                            )
+                        # Download button; the ZIP is assembled straight from the
+                        # generated files, without a second copy on disk
+                        st.download_button(
+                            "📦 Download All Audio Files",
+                            b"".join(stream_zip(output_files, os.getenv("ARCHIVE_COMPRESSION", "stored"))),
+                            file_name="voice_cloning_output.zip",
+                            mime="application/zip",
+                            use_container_width=True
+                        )
                         
                         # Display generated files with beautiful styling
                         st.markdown("### 🎵 Generated Audio Files")
@@ -749,7 +741,7 @@ def main():
                             
                             # Audio player
                             with open(file_path, "rb") as f:
-                                st.audio(f.read(), format='audio/wav')
+                                st.audio(f.read(), format=media_type_for(file_name))
                             
                             # Show only first 3 files to avoid clutter
                             if i >= 2:
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Geria Voice Cloning Archive Streaming
+Builds ZIP archives on the fly instead of writing them to disk first
+"""
+
+import io
+import os
+import time
+import zipfile
+
+COMPRESSION_METHODS = {
+    "stored": zipfile.ZIP_STORED,
+    "deflated": zipfile.ZIP_DEFLATED,
+}
+
+BLOCK_SIZE = 256 * 1024
+
+
+class _StreamSink(io.RawIOBase):
+    """Write-only, unseekable sink that hands written bytes back in pieces"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def stream_zip(entries, compression="stored"):
+    """Yield a ZIP archive of (name, path_or_bytes) entries piece by piece
+
+    Entries are read in blocks and each piece is yielded as soon as it is
+    compressed, so neither the archive nor a whole entry is held in memory.
+    """
+    if compression not in COMPRESSION_METHODS:
+        raise ValueError(f"Unknown compression '{compression}', expected one of {sorted(COMPRESSION_METHODS)}")
+
+    for piece in _zip_pieces(entries, COMPRESSION_METHODS[compression]):
+        if piece:
+            yield piece
+
+
+def _zip_pieces(entries, compress_type):
+    sink = _StreamSink()
+    with zipfile.ZipFile(sink, "w", compression=compress_type) as zipf:
+        for name, source in entries:
+            if isinstance(source, (bytes, bytearray)):
+                size = len(source)
+                date_time = time.localtime()[:6]
+            else:
+                size = os.path.getsize(source)
+                date_time = time.localtime(os.path.getmtime(source))[:6]
+
+            info = zipfile.ZipInfo(name, date_time=date_time)
+            info.compress_type = compress_type
+            # Known up front so zipfile can decide on zip64 without seeking back
+            info.file_size = size
+
+            with zipf.open(info, "w") as entry:
+                if isinstance(source, (bytes, bytearray)):
+                    for offset in range(0, size, BLOCK_SIZE):
+                        entry.write(source[offset:offset + BLOCK_SIZE])
+                        yield sink.drain()
+                else:
+                    with open(source, "rb") as f:
+                        for block in iter(lambda: f.read(BLOCK_SIZE), b""):
+                            entry.write(block)
+                            yield sink.drain()
+            yield sink.drain()
+    # Central directory is written on close
+    yield sink.drain()
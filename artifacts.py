@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Geria Voice Cloning Artifacts
+SQLite index of generated files and the managed directories that hold them
+"""
+
+import os
+import shutil
+import sqlite3
+import threading
+import time
+
+
+class ArtifactRegistry:
+    """Persistent job id -> output path index"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS artifacts (
+                job_id TEXT NOT NULL,
+                name TEXT NOT NULL,
+                path TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (job_id, name)
+            )"""
+        )
+        self._conn.commit()
+
+    def register_many(self, job_id, files):
+        """Record several (name, path) artifacts in one transaction"""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO artifacts (job_id, name, path, created_at) VALUES (?, ?, ?, ?)",
+                [(job_id, name, path, now) for name, path in files]
+            )
+            self._conn.commit()
+
+    def lookup(self, job_id, name):
+        """Path of one artifact, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT path FROM artifacts WHERE job_id = ? AND name = ?",
+                (job_id, name)
+            ).fetchone()
+        return row[0] if row else None
+
+    def list(self, job_id):
+        """All (name, path) artifacts of a job"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, path FROM artifacts WHERE job_id = ? ORDER BY rowid",
+                (job_id,)
+            ).fetchall()
+        return [(name, path) for name, path in rows]
+
+    def remove(self, job_id):
+        """Forget every artifact of a job"""
+        self.execute("DELETE FROM artifacts WHERE job_id = ?", (job_id,))
+
+    def query(self, sql, params=()):
+        """Rows of a read-only statement on the index database"""
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def execute(self, sql, params=()):
+        """Run and commit one write statement (tables of other components live here too)"""
+        with self._lock:
+            self._conn.execute(sql, params)
+            self._conn.commit()
+
+    def execute_many(self, sql, rows):
+        """Run and commit one write statement per parameter row, in one transaction"""
+        with self._lock:
+            self._conn.executemany(sql, rows)
+            self._conn.commit()
+
+
+def _dir_files(path):
+    """(device, inode, size) of the files below path, each inode once"""
+    seen = {}
+    for root, dirs, files in os.walk(path):
+        for name in files:
+            try:
+                st = os.stat(os.path.join(root, name))
+            except OSError:
+                continue
+            seen[(st.st_dev, st.st_ino)] = st.st_size
+    return [(dev, ino, size) for (dev, ino), size in seen.items()]
+
+
+class ArtifactStore:
+    """Managed job directories with per-job TTL and a global byte quota
+
+    Files hard-linked between jobs by incremental reuse count once toward
+    the quota, and evicting a job frees only the files no other job holds.
+    """
+
+    def __init__(self, root, registry, ttl=24 * 3600, max_bytes=5 * 1024 ** 3):
+        self.root = root
+        self.registry = registry
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self.evicted_bytes = 0
+        self._janitor = None
+        os.makedirs(os.path.join(root, "jobs"), exist_ok=True)
+
+        registry.execute(
+            """CREATE TABLE IF NOT EXISTS job_dirs (
+                job_id TEXT PRIMARY KEY,
+                dir TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                bytes INTEGER NOT NULL DEFAULT 0,
+                finalized INTEGER NOT NULL DEFAULT 0
+            )"""
+        )
+        registry.execute(
+            """CREATE TABLE IF NOT EXISTS job_files (
+                job_id TEXT NOT NULL,
+                dev INTEGER NOT NULL,
+                ino INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                PRIMARY KEY (job_id, dev, ino)
+            )"""
+        )
+        registry.execute("CREATE INDEX IF NOT EXISTS job_files_inode ON job_files (dev, ino)")
+        # Jobs finalized before files were tracked individually
+        for job_id, job_dir in registry.query(
+            "SELECT job_id, dir FROM job_dirs WHERE finalized = 1 "
+            "AND job_id NOT IN (SELECT DISTINCT job_id FROM job_files)"
+        ):
+            self._record_files(job_id, job_dir)
+
+    def _record_files(self, job_id, job_dir):
+        """Index the files of a job directory; returns their total size"""
+        files = _dir_files(job_dir)
+        self.registry.execute("DELETE FROM job_files WHERE job_id = ?", (job_id,))
+        self.registry.execute_many(
+            "INSERT INTO job_files (job_id, dev, ino, size) VALUES (?, ?, ?, ?)",
+            [(job_id, dev, ino, size) for dev, ino, size in files]
+        )
+        return sum(size for _, _, size in files)
+
+    def create_job_dir(self, job_id, ttl=None):
+        """Create and register the working directory of a job"""
+        job_dir = os.path.join(self.root, "jobs", job_id)
+        os.makedirs(job_dir, exist_ok=True)
+        now = time.time()
+        self.registry.execute(
+            "INSERT OR REPLACE INTO job_dirs (job_id, dir, created_at, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+            (job_id, job_dir, now, now + (ttl if ttl is not None else self.ttl), now)
+        )
+        return job_dir
+
+    def job_dir(self, job_id):
+        """Directory of a job still held by the store, or None"""
+        rows = self.registry.query("SELECT dir FROM job_dirs WHERE job_id = ?", (job_id,))
+        return rows[0][0] if rows and os.path.isdir(rows[0][0]) else None
+
+    def finalize(self, job_id):
+        """Record a finished job's size, then enforce the quota
+
+        The job counts as just used and its TTL restarts from now, so a job
+        that waited in the queue is not the first to go once it finishes.
+        """
+        rows = self.registry.query("SELECT dir FROM job_dirs WHERE job_id = ?", (job_id,))
+        if not rows:
+            return
+        size = self._record_files(job_id, rows[0][0])
+        now = time.time()
+        self.registry.execute(
+            "UPDATE job_dirs SET bytes = ?, finalized = 1, last_access = ?, "
+            "expires_at = ? + (expires_at - created_at) WHERE job_id = ?",
+            (size, now, now, job_id)
+        )
+        self.enforce_quota()
+
+    def touch(self, job_id):
+        """Mark a job as recently used so LRU eviction keeps it"""
+        self.registry.execute("UPDATE job_dirs SET last_access = ? WHERE job_id = ?", (time.time(), job_id))
+
+    def evict(self, job_id):
+        """Delete a job's directory and forget its artifacts"""
+        rows = self.registry.query("SELECT dir FROM job_dirs WHERE job_id = ?", (job_id,))
+        if not rows:
+            return
+        freed = self.registry.query(
+            "SELECT COALESCE(SUM(size), 0) FROM job_files f WHERE job_id = ? AND NOT EXISTS "
+            "(SELECT 1 FROM job_files o WHERE o.dev = f.dev AND o.ino = f.ino AND o.job_id != f.job_id)",
+            (job_id,)
+        )[0][0]
+        shutil.rmtree(rows[0][0], ignore_errors=True)
+        self.registry.execute("DELETE FROM job_files WHERE job_id = ?", (job_id,))
+        self.registry.execute("DELETE FROM job_dirs WHERE job_id = ?", (job_id,))
+        self.registry.remove(job_id)
+        self.evictions += 1
+        self.evicted_bytes += freed
+
+    def bytes_used(self):
+        """Bytes held by finalized jobs, each hard-linked file once"""
+        return self.registry.query(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT dev, ino, size FROM job_files)"
+        )[0][0]
+
+    def enforce_quota(self):
+        """Evict least recently used finalized jobs until under the byte quota"""
+        if self.bytes_used() <= self.max_bytes:
+            return
+        candidates = self.registry.query(
+            "SELECT job_id FROM job_dirs WHERE finalized = 1 ORDER BY last_access"
+        )
+        for (job_id,) in candidates:
+            self.evict(job_id)
+            # Files still linked from other jobs are not freed, so recount
+            if self.bytes_used() <= self.max_bytes:
+                break
+
+    def sweep(self, in_use=()):
+        """Evict expired jobs, then enforce the quota
+
+        Unfinalized directories of jobs in in_use (queued or running) are kept
+        however old they are; other unfinalized ones are abandoned and expire.
+        """
+        expired = self.registry.query(
+            "SELECT job_id, finalized FROM job_dirs WHERE expires_at <= ?", (time.time(),)
+        )
+        for job_id, finalized in expired:
+            if finalized or job_id not in in_use:
+                self.evict(job_id)
+        self.enforce_quota()
+
+    def start_janitor(self, interval=300, in_use=None):
+        """Sweep periodically on a background thread (idempotent)
+
+        in_use is called before each sweep for the ids of jobs still in progress.
+        """
+        if self._janitor:
+            return
+
+        def loop():
+            while True:
+                try:
+                    self.sweep(in_use() if in_use else ())
+                except Exception as e:
+                    print(f"⚠️ Artifact janitor error: {str(e)}")
+                time.sleep(interval)
+
+        self._janitor = threading.Thread(target=loop, name="artifact-janitor", daemon=True)
+        self._janitor.start()
+
+    def stats(self):
+        """Disk usage and eviction counters for status reporting"""
+        jobs = self.registry.query("SELECT COUNT(*) FROM job_dirs")[0][0]
+        return {
+            "jobs": jobs,
+            "bytes_used": self.bytes_used(),
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl,
+            "evictions": self.evictions,
+            "evicted_bytes": self.evicted_bytes,
+        }
@@ -4,19 +4,53 @@ Geria Voice Cloning Backend API
 Handles AI model loading and voice processing
 """
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
+from starlette.background import BackgroundTask
 import uvicorn
+import base64
+import json
 import tempfile
-import zipfile
 import os
-import re
 from pathlib import Path
-from TTS.api import TTS
+from TTS import __version__ as TTS_VERSION
 import asyncio
+import functools
+import hashlib
+import hmac
+import re
+import threading
 import time
-from typing import List
+import uuid
+from collections import deque
+from concurrent.futures import Future
+from typing import List, Optional
+
+from archive import COMPRESSION_METHODS, stream_zip
+from artifacts import ArtifactRegistry, ArtifactStore
+from cpu_tuning import (
+    available_cpus, configure_threads, default_intra_op_threads, parse_cpu_list, pin_cpus, split_cpus,
+    thread_stats
+)
+from encoding import OUTPUT_FORMATS, encode_to_file, encoder_pool, file_extension, media_type_for, validate_bitrate
+from inference import InferenceExecutor
+from jobs import JobJournal, JobManager, QueueFullError
+from prefork import PreforkPool
+from profiling import SUMMARY_NAME, find_trace, parse_profile_mode, profile_call
+from quantization import build_variants, validate_quantization
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsRegistry, process_rss_bytes, timed_iter
+from manifest import load_manifest, reusable_outputs, reuse_output, write_manifest
+from pipeline import (
+    conditioning_sample_rate, get_xtts, output_sample_rate, inference_settings, synthesize_chunk,
+    stream_chunk, wav_bytes, pcm16_bytes
+)
+from result_cache import SynthesisResultCache, cache_key
+from segmentation import char_limit, plan_chunks
+from snapshot import load_xtts
+from speaker_cache import SpeakerLatentCache, hash_speaker_files
+from speaker_prep import preprocess_speakers
+from uploads import BodySizeLimitMiddleware, InvalidAudioError, UploadTooLargeError, hash_uploads, spool_upload
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -25,6 +59,21 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Per-file and per-request byte limits of speaker uploads
+UPLOAD_MAX_FILE_BYTES = int(os.getenv("UPLOAD_MAX_FILE_BYTES", 50 * 1024 ** 2))
+UPLOAD_MAX_REQUEST_BYTES = int(os.getenv("UPLOAD_MAX_REQUEST_BYTES", 200 * 1024 ** 2))
+UPLOAD_BLOCK_BYTES = int(os.getenv("UPLOAD_BLOCK_BYTES", 1024 ** 2))
+# Uploads are reduced to trimmed, normalized mono clips capped at
+# SPEAKER_MAX_SECONDS in total (SPEAKER_PREPROCESS=0 keeps them as sent)
+SPEAKER_PREPROCESS = os.getenv("SPEAKER_PREPROCESS", "1") != "0"
+SPEAKER_MAX_SECONDS = float(os.getenv("SPEAKER_MAX_SECONDS", 30))
+SPEAKER_TARGET_DBFS = float(os.getenv("SPEAKER_TARGET_DBFS", -20))
+# Room for the text and other form fields on top of the speaker files
+MAX_BODY_BYTES = UPLOAD_MAX_REQUEST_BYTES + 4 * 1024 ** 2
+
+# Added before CORS so 413 responses still carry the CORS headers
+app.add_middleware(BodySizeLimitMiddleware, max_bytes=MAX_BODY_BYTES)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -36,42 +85,120 @@ app.add_middleware(
 
 # Global variables
 tts_model = None
+models = {}
 model_loaded = False
 model_loading = False
+model_warming = False
+model_load_seconds = None
+model_source = None
+warmup_seconds = None
 
-def split_text(text, max_length=400):
-    """Split text into chunks"""
-    words = text.split()
-    chunks, current_chunk = [], []
-    current_length = 0
+# Warm-up syntheses run before readiness flips (WARMUP_RUNS=0 skips them)
+WARMUP_RUNS = int(os.getenv("WARMUP_RUNS", 1))
+WARMUP_SPEAKER = os.getenv("WARMUP_SPEAKER") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "samples", "en_sample.wav"
+)
+WARMUP_TEXT = os.getenv(
+    "WARMUP_TEXT",
+    "Welcome to Geria voice cloning. This short passage warms up the model, "
+    "so the first real request runs at full speed."
+)
 
-    for word in words:
-        if current_length + len(word) + 1 <= max_length:
-            current_chunk.append(word)
-            current_length += len(word) + 1
-        else:
-            chunks.append(' '.join(current_chunk))
-            current_chunk = [word]
-            current_length = len(word) + 1
+# Job outputs and their index live here
+DATA_DIR = os.getenv("DATA_DIR") or os.path.join(tempfile.gettempdir(), "geria_voice_cloning")
+ARCHIVE_NAME = "voice_cloning_output.zip"
+ARCHIVE_COMPRESSION = os.getenv("ARCHIVE_COMPRESSION", "stored")
+artifact_registry = ArtifactRegistry(os.path.join(DATA_DIR, "artifacts.db"))
+artifact_store = ArtifactStore(
+    DATA_DIR,
+    artifact_registry,
+    ttl=float(os.getenv("ARTIFACT_TTL_HOURS", 24)) * 3600,
+    max_bytes=int(os.getenv("ARTIFACT_MAX_BYTES", 5 * 1024 ** 3))
+)
+
+# Synthesized chunk cache (RESULT_CACHE_MAX_BYTES=0 disables it)
+MODEL_NAME = "tts_models/multilingual/multi-dataset/xtts_v2"
+MODEL_VERSION = f"{MODEL_NAME}@{TTS_VERSION}"
+# Set to a persistent directory to cold-start from a memory-mapped model snapshot
+MODEL_SNAPSHOT_DIR = os.getenv("MODEL_SNAPSHOT_DIR") or None
+# QUANTIZATION picks the default model variant; QUANTIZATION_VARIANTS lists
+# every variant kept loaded for per-request selection (e.g. "fp32,int8")
+QUANTIZATION = validate_quantization(os.getenv("QUANTIZATION", "fp32"))
+QUANTIZATION_VARIANTS = sorted(
+    {validate_quantization(v.strip()) for v in os.getenv("QUANTIZATION_VARIANTS", "").split(",") if v.strip()}
+    | {QUANTIZATION}
+)
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", 1024 ** 3))
+result_cache = SynthesisResultCache(
+    os.getenv("RESULT_CACHE_DIR") or os.path.join(DATA_DIR, "result_cache"),
+    max_bytes=RESULT_CACHE_MAX_BYTES
+) if RESULT_CACHE_MAX_BYTES > 0 else None
 
-    if current_chunk:
-        chunks.append(' '.join(current_chunk))
+# Speaker conditioning cache (set SPEAKER_CACHE_DIR to persist latents across restarts)
+speaker_cache = SpeakerLatentCache(
+    max_bytes=int(os.getenv("SPEAKER_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+    cache_dir=os.getenv("SPEAKER_CACHE_DIR") or None
+)
 
-    return chunks
+# Pre-fork mode: INFERENCE_PROCESSES > 0 forks that many workers after model load
+INFERENCE_PROCESSES = int(os.getenv("INFERENCE_PROCESSES", 0))
+INFERENCE_CONCURRENCY = int(os.getenv("INFERENCE_CONCURRENCY", INFERENCE_PROCESSES or 1))
 
-def extract_paragraphs(text):
-    """Extract paragraphs from text"""
-    paragraphs = re.findall(r"Paragraph\s+(\d+):\s*(.*?)(?=Paragraph\s+\d+:|$)", text, re.DOTALL)
-    
-    if not paragraphs:
-        text_paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
-        paragraphs = [(i+1, p) for i, p in enumerate(text_paragraphs)]
-    
-    return paragraphs
+# CPU tuning: CPU_AFFINITY (e.g. "0-7") restricts the backend to those cores,
+# TORCH_THREADS / TORCH_INTEROP_THREADS size torch's thread pools (by default
+# the cores are divided between concurrent model calls) and PIN_WORKERS=1
+# gives every pre-fork worker its own share of the cores
+CPU_AFFINITY = parse_cpu_list(os.getenv("CPU_AFFINITY", ""))
+if CPU_AFFINITY:
+    pin_cpus(CPU_AFFINITY)
+TORCH_INTEROP_THREADS = int(os.getenv("TORCH_INTEROP_THREADS", 0)) or None
+configure_threads(
+    int(os.getenv("TORCH_THREADS", 0)) or default_intra_op_threads(INFERENCE_CONCURRENCY, CPU_AFFINITY),
+    TORCH_INTEROP_THREADS
+)
+
+prefork_pool = PreforkPool(
+    INFERENCE_PROCESSES,
+    threads_per_worker=int(os.getenv("WORKER_THREADS", 0)) or None,
+    cpu_sets=split_cpus(available_cpus(), INFERENCE_PROCESSES) if os.getenv("PIN_WORKERS") == "1" else None
+) if INFERENCE_PROCESSES else None
+
+# Blocking model calls run here so the event loop keeps serving /status etc.
+inference_executor = InferenceExecutor(max_workers=INFERENCE_CONCURRENCY)
+
+# Timings of recent realtime streams (time-to-first-byte, real-time factor)
+realtime_sessions = deque(maxlen=50)
+
+# Prometheus metrics served at /metrics
+metrics = MetricsRegistry()
+stage_seconds = metrics.histogram(
+    "geria_stage_seconds",
+    "Time spent in each pipeline stage (chunk_synthesis and file_write are per chunk)",
+    labelnames=("stage",)
+)
+real_time_factor = metrics.histogram(
+    "geria_real_time_factor",
+    "Synthesis compute seconds per second of audio, per model call",
+    buckets=(0.1, 0.25, 0.5, 0.75, 1, 1.5, 2, 3, 5, 10)
+)
+audio_seconds_total = metrics.counter("geria_audio_seconds_total", "Seconds of audio synthesized")
+chunks_total = metrics.counter("geria_chunks_synthesized_total", "Chunks synthesized by the model")
+speaker_bytes_saved = metrics.counter(
+    "geria_speaker_bytes_saved_total", "Upload bytes removed by speaker preprocessing"
+)
+metrics.gauge("geria_job_queue_depth", "Jobs waiting for a worker", lambda: job_manager.stats()["queued"])
+metrics.gauge("geria_jobs_in_flight", "Jobs being processed", lambda: job_manager.stats()["running"])
+metrics.gauge("geria_inference_queue_depth", "Model calls waiting for the inference executor",
+              lambda: inference_executor.stats()["pending"])
+metrics.gauge("geria_model_ready", "1 once the model is loaded and warmed up",
+              lambda: int(model_loaded and not model_loading))
+metrics.gauge("geria_model_load_seconds", "Time taken to load the model", lambda: model_load_seconds)
+metrics.gauge("geria_warmup_seconds", "Time taken by the warm-up syntheses", lambda: warmup_seconds)
+metrics.gauge("geria_process_resident_memory_bytes", "Resident set size of the backend process", process_rss_bytes)
 
 async def load_tts_model():
     """Load TTS model asynchronously"""
-    global tts_model, model_loaded, model_loading
+    global model_loaded, model_loading, model_warming, warmup_seconds
     
     if model_loaded:
         return tts_model
@@ -84,14 +211,25 @@ async def load_tts_model():
     
     try:
         model_loading = True
-        print("🔄 Loading TTS model...")
-        
-        # Load model in a separate thread to avoid blocking
         loop = asyncio.get_event_loop()
-        tts_model = await loop.run_in_executor(
-            None, 
-            lambda: TTS("tts_models/multilingual/multi-dataset/xtts_v2").to("cpu")
-        )
+        # Pre-fork mode has already loaded the model during startup
+        if tts_model is None:
+            # Load model in a separate thread to avoid blocking
+            await loop.run_in_executor(None, load_models)
+        
+        # Requests keep waiting until warm-up is over, so none pays its one-time costs
+        if WARMUP_RUNS > 0:
+            model_warming = True
+            try:
+                warmup_seconds = round(await loop.run_in_executor(None, warm_up), 3)
+                print(f"🔥 Warm-up finished in {warmup_seconds}s")
+            except Exception as e:
+                print(f"⚠️ Warm-up failed: {str(e)}")
+            finally:
+                model_warming = False
+        
+        # Queued jobs (including ones interrupted by a restart) need the model
+        job_manager.start()
         
         model_loaded = True
         model_loading = False
@@ -104,13 +242,36 @@ async def load_tts_model():
         print(f"❌ Error loading TTS model: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to load TTS model: {str(e)}")
 
+def load_models():
+    """Load the model and its quantized variants (blocking)"""
+    global tts_model, model_load_seconds, model_source
+    print("🔄 Loading TTS model...")
+    started = time.perf_counter()
+    xtts, model_source = load_xtts(MODEL_NAME, MODEL_SNAPSHOT_DIR)
+    models.update(build_variants(xtts, QUANTIZATION_VARIANTS))
+    # Conditioning always uses the model as loaded (fp32 unless quantized in place)
+    tts_model = xtts
+    model_load_seconds = round(time.perf_counter() - started, 3)
+
 @app.on_event("startup")
 async def startup_event():
     """Load model on startup"""
     print("🚀 Starting Geria Voice Cloning Backend...")
+    if prefork_pool:
+        # Load and fork before serving and before any thread starts, so
+        # the workers cannot inherit a lock some other thread was holding
+        load_models()
+        prefork_pool.start(models)
     print("📝 Loading AI model in background...")
     # Start loading model in background
     asyncio.create_task(load_tts_model())
+    # Jobs interrupted by a restart are visible now and resume once the model is loaded
+    job_manager.restore()
+    # Expire old job directories and keep disk usage under quota
+    artifact_store.start_janitor(
+        interval=int(os.getenv("JANITOR_INTERVAL_S", 300)),
+        in_use=job_manager.active_ids
+    )
 
 @app.get("/")
 async def root():
@@ -129,110 +290,884 @@ async def get_status():
     return {
         "model_loaded": model_loaded,
         "model_loading": model_loading,
-        "ready": model_loaded and not model_loading
+        "ready": model_loaded and not model_loading,
+        "warming_up": model_warming,
+        "model_load_seconds": model_load_seconds,
+        "model_source": model_source,
+        "quantization": {"default": QUANTIZATION, "loaded": sorted(models)},
+        "warmup_seconds": warmup_seconds,
+        "speaker_cache": speaker_cache.stats(),
+        "jobs": job_manager.stats(),
+        "inference": inference_executor.stats(),
+        "prefork": prefork_pool.stats() if prefork_pool else None,
+        "cpu": thread_stats(),
+        "artifacts": artifact_store.stats(),
+        "result_cache": result_cache.stats() if result_cache else None,
+        "realtime": realtime_stats()
     }
 
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus metrics: per-stage timings, audio produced, queues and memory"""
+    return PlainTextResponse(metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+def get_speaker_latents(xtts, speaker_paths):
+    """Return (speaker key, conditioning latents), computed on the inference executor"""
+    key = hash_speaker_files(speaker_paths)
+    with stage_seconds.time(stage="speaker_conditioning"):
+        future = inference_executor.submit(speaker_cache.get_latents, xtts, speaker_paths, key)
+        return key, future.result()
+
+def get_model(quantization=None):
+    """Loaded Xtts model for a quantization mode (the startup default when None)"""
+    quantization = quantization or QUANTIZATION
+    if quantization not in models:
+        raise ValueError(f"Quantization {quantization} is not loaded")
+    return get_xtts(models[quantization])
+
+def check_quantization(quantization):
+    """400 unless the requested quantization mode is loaded"""
+    if quantization and quantization not in models:
+        loaded = ", ".join(sorted(models)) or "none"
+        raise HTTPException(status_code=400, detail=f"Quantization {quantization} not loaded (available: {loaded})")
+
+def run_chunk(text, latents, language="en", quantization=None):
+    """Synthesize one chunk on a worker process or in-process, recording its metrics"""
+    quantization = quantization or QUANTIZATION
+    started = time.perf_counter()
+    if prefork_pool:
+        wav = prefork_pool.synthesize(text, latents, language=language, variant=quantization)
+    else:
+        wav = synthesize_chunk(get_model(quantization), text, latents, language=language)
+    elapsed = time.perf_counter() - started
+    
+    audio_seconds = len(wav) / output_sample_rate(get_xtts(tts_model))
+    stage_seconds.observe(elapsed, stage="chunk_synthesis")
+    chunks_total.inc()
+    audio_seconds_total.inc(audio_seconds)
+    if audio_seconds:
+        real_time_factor.observe(elapsed / audio_seconds)
+    return wav
+
+def warm_up():
+    """Run representative syntheses through the normal inference path (blocking)
+    
+    Pays tokenizer and phonemizer setup, kernel selection and allocator growth
+    up front. With pre-fork workers, one run per worker is issued at once.
+    """
+    started = time.perf_counter()
+    xtts = get_xtts(tts_model)
+    speaker_key, latents = get_speaker_latents(xtts, [WARMUP_SPEAKER])
+    futures = [
+        inference_executor.submit(run_chunk, WARMUP_TEXT, latents, "en", quantization)
+        for quantization in models
+        for _ in range(max(WARMUP_RUNS, INFERENCE_PROCESSES))
+    ]
+    for future in futures:
+        future.result()
+    return time.perf_counter() - started
+
+def store_result(key, future):
+    """Done-callback that saves a freshly synthesized chunk in the result cache
+    
+    The callback runs on the inference thread, so the write (np.save, SQLite
+    and eviction) is handed to the encoder pool instead of holding the model.
+    """
+    if not future.cancelled() and future.exception() is None:
+        encoder_pool.submit(result_cache.put, key, future.result())
+
+def write_chunk(output_path, wav, sample_rate, output_format, bitrate):
+    """encode_to_file, timed as the file_write stage"""
+    with stage_seconds.time(stage="file_write"):
+        return encode_to_file(output_path, wav, sample_rate, output_format, bitrate)
+
+def resolved(fn, *args):
+    """Call fn now on this thread, returning its outcome as a completed Future"""
+    future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+def record_chunk(on_chunk, file_name, key, future):
+    """Done-callback that reports a chunk once its output file is complete"""
+    if not future.cancelled() and future.exception() is None:
+        encoded, wav_size = future.result()
+        on_chunk(file_name, key, encoded, wav_size)
+
+def chunk_key(text, speaker_key, language="en", quantization=None):
+    """Content key of one chunk: text, voice, language, model and sampling settings"""
+    quantization = quantization or QUANTIZATION
+    settings = inference_settings(get_model(quantization))
+    version = MODEL_VERSION if quantization == "fp32" else f"{MODEL_VERSION}+{quantization}"
+    return cache_key(text, speaker_key, language, version, settings)
+
+def submit_chunks(speaker_key, latents, planned, language="en", use_cache=True, quantization=None):
+    """Queue every planned chunk on the inference executor, returning one future each
+    
+    Chunks already in the result cache resolve immediately without touching the model.
+    """
+    use_cache = use_cache and result_cache is not None
+    futures = []
+    for item in planned:
+        key = chunk_key(item["text"], speaker_key, language, quantization) if use_cache else None
+        wav = result_cache.get(key) if key else None
+        
+        if wav is not None:
+            future = Future()
+            future.set_result(wav)
+        else:
+            future = inference_executor.submit(run_chunk, item["text"], latents, language, quantization)
+            if key:
+                future.add_done_callback(functools.partial(store_result, key))
+        futures.append(future)
+    return futures
+
+def run_voice_cloning(job_id, job_dir, text_content, speaker_paths,
+                      output_format="wav", bitrate=None, use_cache=True,
+                      previous_job_id=None, progress=None, completed=None, on_chunk=None,
+                      quantization=None, profile=None):
+    """Synthesize every chunk into job_dir and package them (blocking)
+    
+    With previous_job_id, chunks whose content matches that job's manifest
+    are reused from its outputs and only new or edited chunks are synthesized.
+    completed maps file names to chunks already written to job_dir by an
+    interrupted attempt; on_chunk is called as each output file is finished.
+    quantization selects a loaded model variant (the startup default when None).
+    profile ("cprofile" or "torch") stores a trace of this job in job_dir.
+    """
+    args = (
+        job_id, job_dir, text_content, speaker_paths,
+        output_format, bitrate, use_cache, previous_job_id, progress,
+        completed or {}, on_chunk, quantization, bool(profile)
+    )
+    try:
+        with stage_seconds.time(stage="job"):
+            if profile:
+                # Profiled jobs run inline, so they take an inference slot like any model call
+                return inference_executor.submit(
+                    profile_call, profile, job_dir, _run_voice_cloning, *args
+                ).result()
+            return _run_voice_cloning(*args)
+    finally:
+        # Count the job's bytes against the quota whether it succeeded or not
+        artifact_store.finalize(job_id)
+
+def _run_voice_cloning(job_id, job_dir, text_content, speaker_paths,
+                       output_format, bitrate, use_cache, previous_job_id, progress,
+                       completed, on_chunk, quantization, inline=False):
+    # Compute speaker conditioning once per voice, not once per chunk
+    xtts = get_xtts(tts_model)
+    sample_rate = output_sample_rate(xtts)
+    if inline:
+        speaker_key = hash_speaker_files(speaker_paths)
+        latents = speaker_cache.get_latents(xtts, speaker_paths, speaker_key)
+    else:
+        speaker_key, latents = get_speaker_latents(xtts, speaker_paths)
+    
+    planned = plan_chunks(text_content, char_limit("en", xtts), file_extension(output_format))
+    keys = [chunk_key(item["text"], speaker_key, quantization=quantization) for item in planned]
+    
+    # Diff against the previous job's manifest
+    reusable = {}
+    if previous_job_id:
+        previous_dir = artifact_store.job_dir(previous_job_id)
+        if not previous_dir:
+            raise ValueError(f"Previous job {previous_job_id} not found")
+        reusable = reusable_outputs(load_manifest(previous_dir), output_format, bitrate)
+    
+    # Chunks an interrupted attempt already wrote stay as they are
+    resumed = {
+        item["file_name"] for item, key in zip(planned, keys)
+        if item["file_name"] in completed
+        and completed[item["file_name"]]["key"] == key
+        and os.path.exists(os.path.join(job_dir, item["file_name"]))
+    }
+    
+    to_synthesize = [
+        item for item, key in zip(planned, keys)
+        if item["file_name"] not in resumed and key not in reusable
+    ]
+    if inline:
+        # Profiled jobs synthesize and encode on this thread, uncached and
+        # off the executor, so the trace holds the model calls themselves
+        model = get_model(quantization)
+        futures = []
+        pending = (
+            resolved(synthesize_chunk, model, item["text"], latents)
+            for item in to_synthesize
+        )
+    else:
+        futures = submit_chunks(
+            speaker_key, latents, to_synthesize, use_cache=use_cache, quantization=quantization
+        )
+        pending = iter(futures)
+    encode_chunk = resolved if inline else encoder_pool.submit
+    encodes = []
+    output_files = []
+    
+    try:
+        for item, key in zip(planned, keys):
+            file_name = item["file_name"]
+            output_path = os.path.join(job_dir, file_name)
+            
+            if file_name in resumed:
+                encode = Future()
+                encode.set_result((completed[file_name]["bytes"], completed[file_name]["wav_bytes"]))
+                encodes.append(encode)
+            elif key in reusable:
+                previous = reusable[key]
+                reuse_output(previous["path"], output_path)
+                encode = Future()
+                encode.set_result((previous["bytes"], previous["wav_bytes"]))
+                encodes.append(encode)
+            else:
+                # Generate audio; encoding overlaps with the next chunk's synthesis
+                wav = next(pending).result()
+                encodes.append(encode_chunk(
+                    write_chunk, output_path, wav, sample_rate, output_format, bitrate
+                ))
+            
+            if on_chunk and file_name not in resumed:
+                encodes[-1].add_done_callback(functools.partial(record_chunk, on_chunk, file_name, key))
+            
+            output_files.append((file_name, output_path))
+            if progress:
+                progress(len(output_files), len(planned))
+        
+        sizes = [encode.result() for encode in encodes]
+    finally:
+        for future in futures:
+            future.cancel()
+    
+    write_manifest(job_dir, speaker_key, "en", output_format, bitrate, [
+        {
+            "file_name": item["file_name"],
+            "paragraph": item["paragraph"],
+            "part": item["part"],
+            "key": key,
+            "path": path,
+            "bytes": encoded,
+            "wav_bytes": wav_size
+        }
+        for item, key, (_, path), (encoded, wav_size) in zip(planned, keys, output_files, sizes)
+    ])
+    
+    # The ZIP is built on the fly when downloaded
+    artifact_registry.register_many(job_id, output_files)
+    
+    output_bytes = sum(encoded for encoded, _ in sizes)
+    wav_bytes_total = sum(wav for _, wav in sizes)
+    return {
+        "files_generated": len(output_files),
+        "chunks_reused": len(planned) - len(to_synthesize) - len(resumed),
+        "chunks_resumed": len(resumed),
+        "job_dir": job_dir,
+        "output_format": output_format,
+        "quantization": quantization or QUANTIZATION,
+        "output_bytes": output_bytes,
+        "bytes_saved": wav_bytes_total - output_bytes
+    }
+
+def run_job(job):
+    """Job queue handler: run a queued voice cloning job"""
+    params = job.params
+    return run_voice_cloning(
+        job.id,
+        params["job_dir"],
+        params["text_content"],
+        params["speaker_paths"],
+        output_format=params["output_format"],
+        bitrate=params["bitrate"],
+        use_cache=params["use_cache"],
+        previous_job_id=params["previous_job_id"],
+        progress=job.set_progress,
+        completed=job.completed_chunks(),
+        on_chunk=job.record_chunk,
+        quantization=params.get("quantization"),
+        profile=params.get("profile")
+    )
+
+# Jobs and finished chunks are journaled so a restart resumes them (JOB_JOURNAL=0 disables)
+job_journal = JobJournal(
+    os.path.join(DATA_DIR, "jobs.db"),
+    retention=float(os.getenv("ARTIFACT_TTL_HOURS", 24)) * 3600
+) if os.getenv("JOB_JOURNAL", "1") != "0" else None
+
+job_manager = JobManager(
+    run_job,
+    workers=int(os.getenv("JOB_WORKERS", 1)),
+    max_queue=int(os.getenv("JOB_QUEUE_SIZE", 16)),
+    journal=job_journal,
+    max_attempts=int(os.getenv("JOB_MAX_ATTEMPTS", 3)),
+    retention=float(os.getenv("ARTIFACT_TTL_HOURS", 24)) * 3600
+)
+
+JOB_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# Required (as the X-Admin-Token header) by /admin endpoints and profiled
+# requests; both are refused while it is unset
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN") or None
+
+async def prepare_request(text_content, speaker_files, output_format="wav", job_id=None,
+                          quantization=None, bitrate=None):
+    """Validate a request, make sure the model is loaded and save speaker files
+    
+    Returns (job_id, job_dir, speaker_paths) for a new managed job directory.
+    """
+    # Ensure model is loaded
+    if not model_loaded:
+        await load_tts_model()
+    
+    if tts_model is None:
+        raise HTTPException(status_code=500, detail="TTS model not available")
+    
+    # Validate inputs
+    if not speaker_files:
+        raise HTTPException(status_code=400, detail="No speaker files uploaded")
+    
+    if not text_content.strip():
+        raise HTTPException(status_code=400, detail="No text content provided")
+    
+    if output_format not in OUTPUT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported output format: {output_format}")
+    
+    try:
+        validate_bitrate(output_format, bitrate)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    check_quantization(quantization)
+    
+    declared = sum(speaker_file.size or 0 for speaker_file in speaker_files)
+    if declared > UPLOAD_MAX_REQUEST_BYTES:
+        raise HTTPException(status_code=413, detail=f"Speaker files larger than {UPLOAD_MAX_REQUEST_BYTES} bytes")
+    
+    # Create managed job directory
+    job_id = job_id or uuid.uuid4().hex
+    job_dir = artifact_store.create_job_dir(job_id)
+    
+    try:
+        speaker_paths = await save_speaker_files(job_dir, speaker_files)
+        if SPEAKER_PREPROCESS:
+            loop = asyncio.get_event_loop()
+            speaker_paths = await loop.run_in_executor(None, prepare_speakers, speaker_paths)
+    except BaseException:
+        artifact_store.evict(job_id)
+        raise
+    
+    return job_id, job_dir, speaker_paths
+
+async def save_speaker_files(job_dir, speaker_files):
+    """Spool uploads into job_dir block by block, 413/400 on size or header errors"""
+    speaker_paths = []
+    remaining = UPLOAD_MAX_REQUEST_BYTES
+    with stage_seconds.time(stage="upload_read"):
+        for i, speaker_file in enumerate(speaker_files):
+            try:
+                speaker_path, size = await spool_upload(
+                    speaker_file,
+                    os.path.join(job_dir, f"speaker_{i+1}"),
+                    min(UPLOAD_MAX_FILE_BYTES, remaining),
+                    UPLOAD_BLOCK_BYTES
+                )
+            except UploadTooLargeError as e:
+                if remaining < UPLOAD_MAX_FILE_BYTES:
+                    detail = f"Speaker files larger than {UPLOAD_MAX_REQUEST_BYTES} bytes"
+                else:
+                    detail = str(e)
+                raise HTTPException(status_code=413, detail=detail)
+            except InvalidAudioError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            remaining -= size
+            speaker_paths.append(speaker_path)
+    return speaker_paths
+
+def prepare_speakers(speaker_paths):
+    """Canonicalize saved uploads for conditioning (blocking), 400 when unusable"""
+    with stage_seconds.time(stage="speaker_preprocess"):
+        try:
+            speaker_paths, summary = preprocess_speakers(
+                speaker_paths,
+                conditioning_sample_rate(get_xtts(tts_model)),
+                max_seconds=SPEAKER_MAX_SECONDS,
+                target_dbfs=SPEAKER_TARGET_DBFS
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Unusable speaker file: {str(e)}")
+        except RuntimeError as e:
+            raise HTTPException(status_code=400, detail=f"Could not decode speaker file: {str(e)}")
+    speaker_bytes_saved.inc(summary["bytes_in"] - summary["bytes_out"])
+    return speaker_paths
+
+def check_previous_job(previous_job_id):
+    """404 unless the job to diff against still has its outputs and manifest"""
+    if previous_job_id:
+        previous_dir = artifact_store.job_dir(previous_job_id)
+        if not previous_dir or load_manifest(previous_dir) is None:
+            raise HTTPException(status_code=404, detail=f"Previous job not found: {previous_job_id}")
+
+def check_job_id(job_id):
+    """400 unless a client-chosen job id is safe to use as a directory name"""
+    if job_id and not JOB_ID_RE.match(job_id):
+        raise HTTPException(status_code=400, detail="job_id must be 1-64 letters, digits, '-' or '_'")
+
+def check_profile(profile, x_profile=None, admin_token=None):
+    """Profiling mode from the form field or X-Profile header, 400 when unknown
+
+    Profiling is an admin feature, so asking for it needs the admin token.
+    """
+    try:
+        mode = parse_profile_mode(profile or x_profile)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if mode:
+        check_admin(admin_token)
+    return mode
+
+def check_admin(token):
+    """403 unless ADMIN_TOKEN is set and the given token matches it"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin features are disabled (ADMIN_TOKEN is not set)")
+    if not token or not hmac.compare_digest(token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8")):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+def profile_path(job):
+    """Admin download path of a job's profiler trace, None when it was not profiled"""
+    return f"/admin/jobs/{job.id}/profile" if job.params.get("profile") else None
+
+async def request_fingerprint(params, speaker_files):
+    """Hash of a request's parameters and speaker uploads"""
+    digest = hashlib.sha256(json.dumps(params, sort_keys=True).encode("utf-8"))
+    digest.update((await hash_uploads(speaker_files, UPLOAD_BLOCK_BYTES)).encode("utf-8"))
+    return digest.hexdigest()
+
+async def start_job(job_id, speaker_files, text_content, voice_mode="Single Speaker",
+                    output_format="wav", bitrate=None, use_cache=True, previous_job_id=None,
+                    quantization=None, profile=None):
+    """Prepare and queue a request on the (journaled) job manager, 503 when full
+    
+    A client-chosen job_id is claimed atomically, so concurrent posts share
+    one job. Posting it again returns that job, 409 if the text, speakers or
+    settings differ; a failed job is replaced by the new submission.
+    """
+    params = {
+        "text_content": text_content,
+        "voice_mode": voice_mode,
+        "output_format": output_format,
+        "bitrate": bitrate,
+        "use_cache": use_cache,
+        "previous_job_id": previous_job_id,
+        "quantization": quantization,
+        "profile": profile
+    }
+    fingerprint = await request_fingerprint(params, speaker_files) if job_id else None
+    job, created = job_manager.claim(job_id, fingerprint)
+    if not created:
+        if job.params.get("fingerprint") != fingerprint:
+            raise HTTPException(status_code=409, detail=f"Job {job.id} was submitted with different parameters")
+        return job
+    
+    try:
+        # Outputs left behind by a failed job under the same id
+        artifact_store.evict(job.id)
+        check_previous_job(previous_job_id)
+        _, job_dir, speaker_paths = await prepare_request(
+            text_content, speaker_files, output_format, job.id, quantization, bitrate
+        )
+        try:
+            return job_manager.enqueue(job, dict(params, job_dir=job_dir, speaker_paths=speaker_paths))
+        except QueueFullError as e:
+            artifact_store.evict(job.id)
+            raise HTTPException(status_code=503, detail=str(e))
+    except BaseException as e:
+        job_manager.release(job, getattr(e, "detail", None) or str(e) or type(e).__name__)
+        raise
+
 @app.post("/process-voice")
 async def process_voice_cloning(
     text_content: str = Form(...),
     voice_mode: str = Form(default="Single Speaker"),
-    speaker_files: List[UploadFile] = File(...)
+    output_format: str = Form(default="wav"),
+    bitrate: Optional[int] = Form(default=None),
+    use_cache: bool = Form(default=True),
+    previous_job_id: Optional[str] = Form(default=None),
+    job_id: Optional[str] = Form(default=None),
+    quantization: Optional[str] = Form(default=None),
+    profile: Optional[str] = Form(default=None),
+    speaker_files: List[UploadFile] = File(...),
+    x_profile: Optional[str] = Header(default=None),
+    x_admin_token: Optional[str] = Header(default=None)
 ):
-    """Process voice cloning request"""
-    global tts_model
+    """Process voice cloning request
+    
+    Runs as a journaled job, so a backend restart resumes it from its last
+    finished chunk. Retrying the same request with the same job_id
+    re-attaches to that job, or starts it again if it failed.
+    """
+    check_job_id(job_id)
+    profile = check_profile(profile, x_profile, x_admin_token)
     
     try:
-        # Ensure model is loaded
-        if not model_loaded:
-            await load_tts_model()
-        
-        if not tts_model:
-            raise HTTPException(status_code=500, detail="TTS model not available")
-        
-        # Validate inputs
-        if not speaker_files:
-            raise HTTPException(status_code=400, detail="No speaker files uploaded")
-        
-        if not text_content.strip():
-            raise HTTPException(status_code=400, detail="No text content provided")
-        
-        # Create temporary directory
-        temp_dir = tempfile.mkdtemp()
-        output_files = []
-        
-        # Save uploaded speaker files
-        speaker_paths = []
-        for i, speaker_file in enumerate(speaker_files):
-            speaker_path = os.path.join(temp_dir, f"speaker_{i+1}.wav")
-            with open(speaker_path, "wb") as f:
-                content = await speaker_file.read()
-                f.write(content)
-            speaker_paths.append(speaker_path)
-        
-        # Extract paragraphs
-        paragraphs = extract_paragraphs(text_content)
-        
-        # Process each paragraph
-        for para_num, para_text in paragraphs:
-            para_text = para_text.strip().replace('\n', ' ')
-            chunks = split_text(para_text)
-            
-            for part_idx, chunk in enumerate(chunks, start=1):
-                if len(chunks) > 1:
-                    file_name = f"Paragraph_{para_num}_part_{part_idx}.wav"
-                else:
-                    file_name = f"Paragraph_{para_num}.wav"
-                
-                output_path = os.path.join(temp_dir, file_name)
-                
-                # Generate audio
-                tts_model.tts_to_file(
-                    text=chunk,
-                    file_path=output_path,
-                    speaker_wav=speaker_paths,
-                    language="en",
-                    split_sentences=True
-                )
-                
-                output_files.append((file_name, output_path))
+        job = await start_job(
+            job_id, speaker_files, text_content, voice_mode,
+            output_format, bitrate, use_cache, previous_job_id, quantization, profile
+        )
         
-        # Create ZIP file
-        zip_path = os.path.join(temp_dir, "voice_cloning_output.zip")
-        with zipfile.ZipFile(zip_path, 'w') as zipf:
-            for file_name, file_path in output_files:
-                zipf.write(file_path, file_name)
+        await wait_for_job(job)
+        if job.status != "completed":
+            raise HTTPException(status_code=500, detail=f"Processing error: {job.error}")
+        result = job.result
         
         return {
             "success": True,
             "message": "Voice cloning completed successfully",
-            "files_generated": len(output_files),
-            "download_path": f"/download/{os.path.basename(zip_path)}",
-            "temp_dir": temp_dir
+            "job_id": job.id,
+            "files_generated": result["files_generated"],
+            "chunks_reused": result["chunks_reused"],
+            "chunks_resumed": result["chunks_resumed"],
+            "output_format": result["output_format"],
+            "quantization": result["quantization"],
+            "output_bytes": result["output_bytes"],
+            "bytes_saved": result["bytes_saved"],
+            "download_path": f"/download/{job.id}",
+            "profile_path": profile_path(job),
+            "job_dir": result["job_dir"]
         }
         
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Processing error: {str(e)}")
+
+async def wait_for_job(job):
+    """Await a job's completion without holding an executor thread"""
+    loop = asyncio.get_running_loop()
+    finished = loop.create_future()
+    
+    def wake():
+        if not finished.done():
+            finished.set_result(None)
+    
+    def notify(job):
+        try:
+            loop.call_soon_threadsafe(wake)
+        except RuntimeError:
+            # The event loop is gone; nobody is waiting any more
+            pass
+    
+    job.add_done_callback(notify)
+    await finished
+
+def sse_event(event, data):
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def stream_voice_cloning(text_content, speaker_paths, use_cache=True, quantization=None):
+    """Yield SSE messages carrying each chunk's audio as soon as it is ready"""
+    xtts = get_xtts(tts_model)
+    sample_rate = output_sample_rate(xtts)
+    planned = plan_chunks(text_content, char_limit("en", xtts))
+    
+    yield sse_event("start", {"chunks_total": len(planned), "sample_rate": sample_rate})
+    
+    loop = asyncio.get_event_loop()
+    futures = []
+    try:
+        speaker_key, latents = await loop.run_in_executor(
+            None, get_speaker_latents, xtts, speaker_paths
+        )
+        # Cache lookups read from disk, so keep them off the event loop too
+        futures = await loop.run_in_executor(
+            None, lambda: submit_chunks(
+                speaker_key, latents, planned, use_cache=use_cache, quantization=quantization
+            )
+        )
+        
+        for index, (item, future) in enumerate(zip(planned, futures), start=1):
+            wav = await asyncio.wrap_future(future)
+            yield sse_event("chunk", {
+                "index": index,
+                "paragraph": item["paragraph"],
+                "part": item["part"],
+                "parts": item["parts"],
+                "file_name": item["file_name"],
+                "duration": round(len(wav) / sample_rate, 3),
+                "audio": base64.b64encode(wav_bytes(wav, sample_rate)).decode()
+            })
+        
+        yield sse_event("done", {"files_generated": len(planned)})
+        
+    except Exception as e:
+        yield sse_event("error", {"detail": f"Processing error: {str(e)}"})
+    finally:
+        # Drop chunks nobody is waiting for any more (client went away)
+        for future in futures:
+            future.cancel()
+
+@app.post("/process-voice/stream")
+async def process_voice_cloning_stream(
+    text_content: str = Form(...),
+    voice_mode: str = Form(default="Single Speaker"),
+    use_cache: bool = Form(default=True),
+    quantization: Optional[str] = Form(default=None),
+    speaker_files: List[UploadFile] = File(...)
+):
+    """Process voice cloning, streaming each chunk's WAV as an SSE event in order"""
+    job_id, job_dir, speaker_paths = await prepare_request(
+        text_content, speaker_files, quantization=quantization
+    )
+    
+    return StreamingResponse(
+        stream_voice_cloning(text_content, speaker_paths, use_cache, quantization),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(artifact_store.finalize, job_id)
+    )
+
+def realtime_stats():
+    """Summarize recent realtime streams"""
+    sessions = list(realtime_sessions)
+    if not sessions:
+        return {"sessions": 0}
+    return {
+        "sessions": len(sessions),
+        "last": sessions[-1],
+        "ttfb_seconds_avg": round(sum(s["ttfb_seconds"] for s in sessions) / len(sessions), 3),
+        "rtf_avg": round(sum(s["rtf"] for s in sessions) / len(sessions), 3)
+    }
+
+async def stream_realtime(planned, latents, stream_chunk_size, received_at, quantization=None):
+    """Yield raw PCM frames while XTTS is still decoding each chunk
+    
+    A failure re-raises after the frames sent so far, so the response is
+    cut off instead of ending as if it were complete.
+    """
+    xtts = get_xtts(tts_model)
+    model = get_model(quantization)
+    sample_rate = output_sample_rate(xtts)
+    
+    loop = asyncio.get_running_loop()
+    frames = asyncio.Queue()
+    finished = object()
+    cancelled = threading.Event()
+    timing = {}
+    
+    def produce():
+        timing["started_at"] = time.perf_counter()
+        try:
+            for item in planned:
+                for frame in stream_chunk(model, item["text"], latents, "en", stream_chunk_size):
+                    if cancelled.is_set():
+                        return
+                    loop.call_soon_threadsafe(frames.put_nowait, frame)
+        finally:
+            timing["finished_at"] = time.perf_counter()
+            loop.call_soon_threadsafe(frames.put_nowait, finished)
+    
+    future = inference_executor.submit(produce)
+    first_frame_at = None
+    samples = 0
+    
+    try:
+        while True:
+            frame = await frames.get()
+            if frame is finished:
+                break
+            if first_frame_at is None:
+                first_frame_at = time.perf_counter()
+            samples += len(frame)
+            yield pcm16_bytes(frame)
+    finally:
+        cancelled.set()
+    
+    try:
+        await asyncio.wrap_future(future)
     except Exception as e:
+        print(f"❌ Realtime stream failed: {str(e)}")
+        raise
+    
+    audio_seconds = samples / sample_rate
+    compute_seconds = timing["finished_at"] - timing["started_at"]
+    session = {
+        "chunks": len(planned),
+        "audio_seconds": round(audio_seconds, 3),
+        "ttfb_seconds": round((first_frame_at or time.perf_counter()) - received_at, 3),
+        "rtf": round(compute_seconds / audio_seconds, 3) if audio_seconds else 0.0
+    }
+    realtime_sessions.append(session)
+    chunks_total.inc(len(planned))
+    audio_seconds_total.inc(audio_seconds)
+    if audio_seconds:
+        real_time_factor.observe(compute_seconds / audio_seconds)
+    print(f"⚡ Realtime stream: TTFB {session['ttfb_seconds']}s, RTF {session['rtf']}")
+
+@app.post("/process-voice/realtime")
+async def process_voice_cloning_realtime(
+    text_content: str = Form(...),
+    voice_mode: str = Form(default="Single Speaker"),
+    stream_chunk_size: int = Form(default=20),
+    quantization: Optional[str] = Form(default=None),
+    speaker_files: List[UploadFile] = File(...)
+):
+    """Low-latency mode: stream 16-bit mono PCM while each chunk is generated
+    
+    Conditioning and the first frame are awaited before the response
+    starts, so failures up to that point get a proper status code.
+    """
+    received_at = time.perf_counter()
+    job_id, job_dir, speaker_paths = await prepare_request(
+        text_content, speaker_files, quantization=quantization
+    )
+    xtts = get_xtts(tts_model)
+    sample_rate = output_sample_rate(xtts)
+    
+    try:
+        planned = plan_chunks(text_content, char_limit("en", xtts))
+        if not planned:
+            raise HTTPException(status_code=400, detail="No text content provided")
+        with stage_seconds.time(stage="speaker_conditioning"):
+            latents = await asyncio.wrap_future(
+                inference_executor.submit(speaker_cache.get_latents, xtts, speaker_paths)
+            )
+        stream = stream_realtime(planned, latents, stream_chunk_size, received_at, quantization)
+        first_frame = await stream.__anext__()
+    except HTTPException:
+        artifact_store.evict(job_id)
+        raise
+    except Exception as e:
+        artifact_store.evict(job_id)
         raise HTTPException(status_code=500, detail=f"Processing error: {str(e)}")
+    
+    async def frames():
+        yield first_frame
+        async for frame in stream:
+            yield frame
+    
+    return StreamingResponse(
+        frames(),
+        media_type=f"audio/L16; rate={sample_rate}; channels=1",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            "X-Sample-Rate": str(sample_rate)
+        },
+        background=BackgroundTask(artifact_store.finalize, job_id)
+    )
 
-@app.get("/download/{filename}")
-async def download_file(filename: str):
-    """Download generated files"""
-    # In production, implement proper file serving with cleanup
-    temp_dir = tempfile.gettempdir()
-    file_path = None
+@app.post("/jobs", status_code=202)
+async def submit_job(
+    text_content: str = Form(...),
+    voice_mode: str = Form(default="Single Speaker"),
+    output_format: str = Form(default="wav"),
+    bitrate: Optional[int] = Form(default=None),
+    use_cache: bool = Form(default=True),
+    previous_job_id: Optional[str] = Form(default=None),
+    job_id: Optional[str] = Form(default=None),
+    quantization: Optional[str] = Form(default=None),
+    profile: Optional[str] = Form(default=None),
+    speaker_files: List[UploadFile] = File(...),
+    x_profile: Optional[str] = Header(default=None),
+    x_admin_token: Optional[str] = Header(default=None)
+):
+    """Queue a voice cloning job and return its id immediately
     
-    # Find the file in temp directories
-    for root, dirs, files in os.walk(temp_dir):
-        if filename in files:
-            file_path = os.path.join(root, filename)
-            break
+    Submitting the same request again with the same job_id returns the
+    existing job (409 if it differs); a failed job is queued again.
+    """
+    check_job_id(job_id)
+    profile = check_profile(profile, x_profile, x_admin_token)
+    job = await start_job(
+        job_id, speaker_files, text_content, voice_mode,
+        output_format, bitrate, use_cache, previous_job_id, quantization, profile
+    )
+    
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_path": f"/jobs/{job.id}",
+        "result_path": f"/jobs/{job.id}/result"
+    }
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Report job status and, once finished, its result"""
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    info = job.to_dict()
+    if job.status == "completed":
+        info["success"] = True
+        info["files_generated"] = job.result["files_generated"]
+        info["chunks_reused"] = job.result["chunks_reused"]
+        info["chunks_resumed"] = job.result.get("chunks_resumed", 0)
+        info["output_format"] = job.result["output_format"]
+        info["quantization"] = job.result.get("quantization", QUANTIZATION)
+        info["output_bytes"] = job.result["output_bytes"]
+        info["bytes_saved"] = job.result["bytes_saved"]
+        info["download_path"] = f"/download/{job.id}"
+        info["profile_path"] = profile_path(job)
+    return info
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str, compression: str = ARCHIVE_COMPRESSION):
+    """Download the ZIP produced by a completed job"""
+    job = job_manager.get(job_id)
+    if job and job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    
+    return await download_file(job_id, compression)
+
+@app.get("/download/{job_id}")
+async def download_file(job_id: str, compression: str = ARCHIVE_COMPRESSION):
+    """Download the ZIP package of a job, built while it is being sent"""
+    if compression not in COMPRESSION_METHODS:
+        raise HTTPException(status_code=400, detail=f"Unknown compression: {compression}")
+    
+    output_files = [
+        (name, path) for name, path in artifact_registry.list(job_id)
+        if os.path.exists(path)
+    ]
+    if not output_files:
+        raise HTTPException(status_code=404, detail="File not found")
+    
+    artifact_store.touch(job_id)
+    return StreamingResponse(
+        timed_iter(stream_zip(output_files, compression), stage_seconds, stage="zip_build"),
+        media_type='application/zip',
+        headers={"Content-Disposition": f'attachment; filename="{ARCHIVE_NAME}"'}
+    )
+
+@app.get("/download/{job_id}/{filename}")
+async def download_job_file(job_id: str, filename: str):
+    """Download a single generated file of a job"""
+    file_path = artifact_registry.lookup(job_id, filename)
     
     if not file_path or not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail="File not found")
     
+    artifact_store.touch(job_id)
+    return FileResponse(file_path, media_type=media_type_for(filename), filename=filename)
+
+@app.get("/admin/jobs/{job_id}/profile")
+async def get_job_profile(job_id: str, summary: bool = False,
+                          x_admin_token: Optional[str] = Header(default=None)):
+    """Download the profiler trace of a job (its top-50 text summary with summary=true)"""
+    check_admin(x_admin_token)
+    job_dir = artifact_store.job_dir(job_id)
+    trace_path, mode = find_trace(job_dir) if job_dir else (None, None)
+    if not trace_path:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    artifact_store.touch(job_id)
+    if summary:
+        return FileResponse(os.path.join(job_dir, SUMMARY_NAME), media_type="text/plain")
     return FileResponse(
-        file_path,
-        media_type='application/zip',
-        filename=filename
+        trace_path,
+        media_type="application/json" if mode == "torch" else "application/octet-stream",
+        filename=f"{job_id}_{os.path.basename(trace_path)}"
     )
 
 if __name__ == "__main__":
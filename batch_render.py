@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Geria Voice Cloning Batch Renderer
+Parallel, resumable rendering of scripts to audio files
+
+Usage:
+    python batch_render.py script.txt --speakers Arabella*.wav --output-dir out
+    python batch_render.py scripts/ --speakers voices/ --output-dir out --workers 4
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from encoding import OUTPUT_FORMATS, encode_to_file, file_extension, validate_bitrate
+from result_cache import cache_key
+from segmentation import char_limit, plan_chunks
+
+MODEL_NAME = "tts_models/multilingual/multi-dataset/xtts_v2"
+CHECKPOINT_NAME = ".batch_checkpoint.jsonl"
+AUDIO_EXTENSIONS = {".wav", ".mp3", ".flac", ".ogg"}
+
+# Per-process state, set by the parent before forking or by _init_worker
+_xtts = None
+_latents = None
+
+
+def load_model():
+    """Load XTTS on CPU (from MODEL_SNAPSHOT_DIR when set) and return the Xtts model"""
+    from snapshot import load_xtts
+
+    xtts, _ = load_xtts(MODEL_NAME, os.getenv("MODEL_SNAPSHOT_DIR") or None)
+    return xtts
+
+
+def _init_worker(threads, speaker_paths, cache_dir):
+    """Pin threads; load the model and voice unless inherited through fork"""
+    global _xtts, _latents
+    import torch
+    from speaker_cache import SpeakerLatentCache
+
+    torch.set_num_threads(threads)
+    if _xtts is None:
+        _xtts = load_model()
+    if _latents is None:
+        _latents = SpeakerLatentCache(cache_dir=cache_dir).get_latents(_xtts, speaker_paths)
+
+
+def _render(text, output_path, language, output_format, bitrate):
+    """Synthesize one chunk and write it atomically"""
+    from pipeline import output_sample_rate, synthesize_chunk
+
+    started = time.perf_counter()
+    wav = synthesize_chunk(_xtts, text, _latents, language=language)
+    tmp_path = f"{output_path}.part"
+    encode_to_file(tmp_path, wav, output_sample_rate(_xtts), output_format, bitrate)
+    os.replace(tmp_path, output_path)
+    return time.perf_counter() - started
+
+
+def find_scripts(path):
+    """A single script file, or every .txt file in a directory"""
+    path = Path(path)
+    if path.is_dir():
+        return sorted(p for p in path.iterdir() if p.suffix.lower() == ".txt")
+    return [path]
+
+
+def find_speakers(paths):
+    """Expand speaker arguments (files or directories) into audio files"""
+    speakers = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            speakers.extend(sorted(p for p in path.iterdir() if p.suffix.lower() in AUDIO_EXTENSIONS))
+        else:
+            speakers.append(path)
+    return [str(p) for p in speakers]
+
+
+def load_checkpoint(checkpoint_path):
+    """Map output path -> content key of the outputs finished by earlier runs"""
+    done = {}
+    if not os.path.exists(checkpoint_path):
+        return done
+    with open(checkpoint_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                done[entry["output"]] = entry.get("key")
+            except (ValueError, KeyError):
+                # A line cut short by a crash; that output is simply redone
+                continue
+    return done
+
+
+def chunk_key(text, speaker_key, language, output_format, bitrate):
+    """Content key of one output: text, voice, language and encoding"""
+    return cache_key(text, speaker_key, language, MODEL_NAME, {"format": output_format, "bitrate": bitrate})
+
+
+def plan_tasks(scripts, output_dir, max_chars, extension):
+    """(output path, text) for every chunk of every script"""
+    tasks = []
+    for script in scripts:
+        script_dir = output_dir / script.stem if len(scripts) > 1 else output_dir
+        script_dir.mkdir(parents=True, exist_ok=True)
+        text = script.read_text(encoding="utf-8")
+        for item in plan_chunks(text, max_chars, extension):
+            tasks.append((str(script_dir / item["file_name"]), item["text"]))
+    return tasks
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Render scripts to cloned-voice audio in parallel")
+    parser.add_argument("input", help="Script file or directory of .txt scripts")
+    parser.add_argument("--speakers", nargs="+", required=True, help="Speaker audio files or directories")
+    parser.add_argument("--output-dir", required=True, help="Directory for generated audio")
+    parser.add_argument("--workers", type=int, default=1, help="Inference processes (default: 1)")
+    parser.add_argument("--threads-per-worker", type=int, default=0,
+                        help="torch threads per worker (default: CPU count / workers)")
+    parser.add_argument("--language", default="en", help="Language code (default: en)")
+    parser.add_argument("--format", default="wav", choices=sorted(OUTPUT_FORMATS), help="Output format")
+    parser.add_argument("--bitrate", type=int, default=None, help="Bitrate in kbps for opus/mp3")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and render everything")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    global _xtts, _latents
+    args = parse_args(argv)
+    try:
+        validate_bitrate(args.format, args.bitrate)
+    except ValueError as e:
+        print(f"❌ {str(e)}")
+        return 1
+
+    scripts = find_scripts(args.input)
+    speaker_paths = find_speakers(args.speakers)
+    if not scripts or not speaker_paths:
+        print("❌ No scripts or speaker files found")
+        return 1
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    checkpoint_path = output_dir / CHECKPOINT_NAME
+    cache_dir = str(output_dir / ".speaker_cache")
+    threads = args.threads_per_worker or max(1, (os.cpu_count() or 1) // args.workers)
+
+    from speaker_cache import hash_speaker_files
+
+    tasks = plan_tasks(scripts, output_dir, char_limit(args.language), file_extension(args.format))
+    speaker_key = hash_speaker_files(speaker_paths)
+    keys = {
+        path: chunk_key(text, speaker_key, args.language, args.format, args.bitrate)
+        for path, text in tasks
+    }
+    # An output is only done if it was rendered from the same text, voice, language and encoding
+    done = {} if args.restart else load_checkpoint(checkpoint_path)
+    remaining = [
+        (path, text) for path, text in tasks
+        if not (done.get(path) == keys[path] and os.path.exists(path))
+    ]
+    print(f"📝 {len(scripts)} script(s), {len(tasks)} chunk(s), {len(tasks) - len(remaining)} already done")
+    if not remaining:
+        print("✅ Nothing to do")
+        return 0
+
+    # With fork, load once here so workers share the weights copy-on-write
+    use_fork = "fork" in multiprocessing.get_all_start_methods()
+    if use_fork:
+        from speaker_cache import SpeakerLatentCache
+
+        print("🔄 Loading TTS model...")
+        _xtts = load_model()
+        _latents = SpeakerLatentCache(cache_dir=cache_dir).get_latents(_xtts, speaker_paths)
+
+    context = multiprocessing.get_context("fork" if use_fork else "spawn")
+    started = time.perf_counter()
+    failures = 0
+    with open(checkpoint_path, "w" if args.restart else "a", encoding="utf-8") as checkpoint, \
+            ProcessPoolExecutor(
+                max_workers=args.workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(threads, speaker_paths, cache_dir)
+            ) as pool:
+        futures = {
+            pool.submit(_render, text, path, args.language, args.format, args.bitrate): path
+            for path, text in remaining
+        }
+        for finished, future in enumerate(as_completed(futures), start=1):
+            path = futures[future]
+            try:
+                seconds = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"❌ {path}: {str(e)}")
+                continue
+            checkpoint.write(json.dumps({"output": path, "key": keys[path], "seconds": round(seconds, 3)}) + "\n")
+            checkpoint.flush()
+            os.fsync(checkpoint.fileno())
+            print(f"[{finished}/{len(remaining)}] Generated: {path}")
+
+    elapsed = time.perf_counter() - started
+    print(f"{'✅' if not failures else '⚠️'} Rendered {len(remaining) - failures} chunk(s) in {elapsed:.1f}s"
+          f"{f', {failures} failed (re-run to retry)' if failures else ''}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Geria Voice Cloning Benchmark
+End-to-end pipeline benchmark (segmentation, conditioning, synthesis, encoding, archiving)
+
+Runs the backend's own job pipeline either with a deterministic stub engine
+(fast, no model download) or with the real XTTS model, and reports real-time
+factor, latency percentiles, throughput and peak RSS as JSON. Results are
+compared against benchmark_baseline.json so regressions fail the run; the
+numbers are host-specific, so record the baseline on the host that runs it.
+
+Usage:
+    python benchmark.py                          # stub engine, compare to baseline
+    python benchmark.py --engine xtts --requests 4
+    python benchmark.py --save-baseline          # record the current numbers
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import types
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+import torch
+
+from metrics import peak_rss_bytes
+
+ROOT = Path(__file__).parent
+BASELINE_PATH = ROOT / "benchmark_baseline.json"
+DEFAULT_SCRIPT = """Paragraph 1: Welcome to Geria voice cloning. This benchmark reads a short script aloud, one paragraph at a time, and measures every stage of the pipeline.
+
+Paragraph 2: Each paragraph is split into sentence-aligned chunks. The chunks are synthesized one after another, encoded while the next chunk is generated, and finally packaged into a single archive for download.
+
+Paragraph 3: Short lines matter too. So do long ones, which run past the tokenizer's character budget and must be divided at clause boundaries, commas, semicolons and all, without ever cutting a word in half.
+"""
+
+# Settings that must match for a comparison with the baseline to mean anything
+WORKLOAD_KEYS = ("stub_rtf", "requests", "concurrency", "output_format", "compression", "chunks_per_request")
+
+# Metrics where a larger value is worse; throughput is the opposite
+LOWER_IS_BETTER = ("rtf", "latency_p50_seconds", "latency_p95_seconds", "latency_p99_seconds", "peak_rss_bytes")
+HIGHER_IS_BETTER = ("throughput_audio_seconds_per_second", "throughput_requests_per_second")
+
+
+class StubXtts(torch.nn.Module):
+    """Deterministic stand-in for Xtts with the same interface the pipeline uses
+
+    Speaker files are really decoded, audio is derived from the text hash and
+    synthesis sleeps for rtf x the audio duration, so the pipeline around the
+    model is measured with realistic shapes but without the model's cost.
+    """
+
+    CHARS_PER_SECOND = 15
+
+    def __init__(self, rtf=0.01, sample_rate=24000):
+        super().__init__()
+        from segmentation import DEFAULT_CHAR_LIMITS
+
+        self.rtf = rtf
+        self.config = types.SimpleNamespace(
+            audio=types.SimpleNamespace(output_sample_rate=sample_rate, sample_rate=22050),
+            temperature=0.75, length_penalty=1.0, repetition_penalty=10.0, top_k=50, top_p=0.85,
+            gpt_cond_len=30, gpt_cond_chunk_len=4, max_ref_len=30, sound_norm_refs=False,
+        )
+        self.tokenizer = types.SimpleNamespace(char_limits=DEFAULT_CHAR_LIMITS)
+
+    def get_conditioning_latents(self, audio_path, **kwargs):
+        features = []
+        for path in audio_path:
+            audio, _ = sf.read(path, dtype="float32", always_2d=True)
+            features.append(float(np.abs(audio).mean()))
+        seed = int(hashlib.sha256(repr(features).encode()).hexdigest()[:8], 16)
+        generator = torch.Generator().manual_seed(seed)
+        return torch.randn(1, 32, 1024, generator=generator), torch.randn(1, 512, 1, generator=generator)
+
+    def _wav(self, text):
+        seconds = max(0.5, len(text) / self.CHARS_PER_SECOND)
+        samples = int(seconds * self.config.audio.output_sample_rate)
+        seed = int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+        wav = np.random.default_rng(seed).standard_normal(samples).astype(np.float32) * 0.1
+        time.sleep(seconds * self.rtf)
+        return wav
+
+    def inference(self, text, language, gpt_cond_latent, speaker_embedding, **kwargs):
+        return {"wav": self._wav(text)}
+
+    def inference_stream(self, text, language, gpt_cond_latent, speaker_embedding, stream_chunk_size=20, **kwargs):
+        for segment in np.array_split(self._wav(text), 4):
+            yield torch.from_numpy(segment)
+
+
+def percentile(values, q):
+    """q-th percentile (0-100) with linear interpolation"""
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def speaker_sets():
+    """Bundled voices: all Arabella takes together, then each language sample alone"""
+    sets = []
+    arabella = sorted(str(p) for p in ROOT.glob("Arabella*.wav"))
+    if arabella:
+        sets.append(arabella)
+    sets.extend([str(p)] for p in sorted((ROOT / "samples").glob("*.wav")))
+    return sets
+
+
+def load_backend(engine, stub_rtf):
+    """Import the backend against a scratch data dir with the chosen engine loaded"""
+    os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="geria_benchmark_")
+    # Every request must do the full work: no result cache, journal or warm-up
+    os.environ["RESULT_CACHE_MAX_BYTES"] = "0"
+    os.environ["JOB_JOURNAL"] = "0"
+    if engine == "stub":
+        os.environ["WARMUP_RUNS"] = "0"
+
+    import asyncio
+    import backend
+
+    if engine == "stub":
+        stub = StubXtts(rtf=stub_rtf)
+        backend.tts_model = stub
+        backend.models["fp32"] = stub
+        backend.model_loaded = True
+    else:
+        asyncio.run(backend.load_tts_model())
+    return backend
+
+
+def run_request(backend, script, speaker_paths, output_format, compression):
+    """One full request: synthesize the script and build its archive; returns timings"""
+    from archive import stream_zip
+    from manifest import load_manifest
+
+    started = time.perf_counter()
+    job_id = uuid.uuid4().hex
+    job_dir = backend.artifact_store.create_job_dir(job_id)
+    result = backend.run_voice_cloning(job_id, job_dir, script, speaker_paths, output_format=output_format)
+    archive_bytes = sum(len(piece) for piece in stream_zip(backend.artifact_registry.list(job_id), compression))
+    latency = time.perf_counter() - started
+
+    sample_rate = backend.output_sample_rate(backend.get_xtts(backend.tts_model))
+    chunks = load_manifest(job_dir)["chunks"]
+    audio_seconds = sum((chunk["wav_bytes"] - 44) / 2 for chunk in chunks) / sample_rate
+    backend.artifact_store.evict(job_id)
+    return {
+        "latency_seconds": latency,
+        "audio_seconds": audio_seconds,
+        "chunks": len(chunks),
+        "output_bytes": result["output_bytes"],
+        "bytes_saved": result["bytes_saved"],
+        "archive_bytes": archive_bytes,
+    }
+
+
+def run_benchmark(args):
+    backend = load_backend(args.engine, args.stub_rtf)
+    script = Path(args.script).read_text(encoding="utf-8") if args.script else DEFAULT_SCRIPT
+    voices = speaker_sets()
+    workload = [voices[i % len(voices)] for i in range(args.requests)]
+
+    # Conditioning is computed once per voice; do it up front so percentiles
+    # describe steady state, and report the cold cost separately
+    started = time.perf_counter()
+    for speakers in voices:
+        backend.get_speaker_latents(backend.get_xtts(backend.tts_model), speakers)
+    conditioning_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as clients:
+        results = list(clients.map(
+            lambda speakers: run_request(backend, script, speakers, args.format, args.compression),
+            workload
+        ))
+    wall = time.perf_counter() - started
+    shutil.rmtree(os.environ["DATA_DIR"], ignore_errors=True)
+
+    latencies = [r["latency_seconds"] for r in results]
+    audio_seconds = sum(r["audio_seconds"] for r in results)
+    return {
+        "engine": args.engine,
+        "stub_rtf": args.stub_rtf if args.engine == "stub" else None,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "output_format": args.format,
+        "compression": args.compression,
+        "voices": len(voices),
+        "chunks_per_request": results[0]["chunks"] if results else 0,
+        "conditioning_seconds": round(conditioning_seconds / len(voices), 4) if voices else 0.0,
+        "rtf": round(sum(latencies) / audio_seconds, 4) if audio_seconds else 0.0,
+        "latency_p50_seconds": round(percentile(latencies, 50), 4),
+        "latency_p95_seconds": round(percentile(latencies, 95), 4),
+        "latency_p99_seconds": round(percentile(latencies, 99), 4),
+        "throughput_audio_seconds_per_second": round(audio_seconds / wall, 3),
+        "throughput_requests_per_second": round(len(results) / wall, 3),
+        "peak_rss_bytes": peak_rss_bytes(),
+        "output_bytes": sum(r["output_bytes"] for r in results),
+        "bytes_saved": sum(r["bytes_saved"] for r in results),
+        "archive_bytes": sum(r["archive_bytes"] for r in results),
+    }
+
+
+def compare(report, baseline, tolerance):
+    """List the metrics that regressed by more than tolerance (a fraction)"""
+    regressions = []
+    for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+        before, after = baseline.get(metric), report.get(metric)
+        if not before or after is None:
+            continue
+        change = (after - before) / before
+        worse = change > tolerance if metric in LOWER_IS_BETTER else change < -tolerance
+        if worse:
+            regressions.append({"metric": metric, "baseline": before, "current": after,
+                                "change": round(change, 4)})
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the voice cloning pipeline end to end")
+    parser.add_argument("--engine", choices=("stub", "xtts"), default="stub",
+                        help="Deterministic stub engine or the real XTTS model (default: stub)")
+    parser.add_argument("--requests", type=int, default=12, help="Requests to run (default: 12)")
+    parser.add_argument("--concurrency", type=int, default=2, help="Concurrent clients (default: 2)")
+    parser.add_argument("--script", default=None, help="Script file (default: built-in three paragraphs)")
+    parser.add_argument("--format", default="wav", help="Output format (default: wav)")
+    parser.add_argument("--compression", default="stored", help="ZIP compression (default: stored)")
+    parser.add_argument("--stub-rtf", type=float, default=0.01, help="Simulated real-time factor of the stub")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="Baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed relative change before a metric counts as a regression (default: 0.25)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the engine's baseline")
+    parser.add_argument("--output", default=None, help="Write the JSON report here")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print(f"⏱️ Benchmarking {args.requests} request(s) with the {args.engine} engine...", file=sys.stderr)
+    report = run_benchmark(args)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baselines = json.load(f)
+
+    if args.save_baseline:
+        baselines[args.engine] = report
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2)
+            f.write("\n")
+        print(f"💾 Baseline for {args.engine} saved to {args.baseline}", file=sys.stderr)
+    elif args.engine in baselines:
+        baseline = baselines[args.engine]
+        mismatched = [key for key in WORKLOAD_KEYS if baseline.get(key) != report.get(key)]
+        if mismatched:
+            print(f"⚠️ Workload differs from the baseline ({', '.join(mismatched)}); not comparing",
+                  file=sys.stderr)
+        else:
+            report["regressions"] = compare(report, baseline, args.tolerance)
+    else:
+        print(f"⚠️ No {args.engine} baseline in {args.baseline}; record one on the reference host "
+              f"with --save-baseline", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+    for regression in report.get("regressions", []):
+        print(f"❌ {regression['metric']}: {regression['baseline']} -> {regression['current']} "
+              f"({regression['change']:+.0%})", file=sys.stderr)
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
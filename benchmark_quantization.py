@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Geria Voice Cloning Quantization Benchmark
+Compares real-time factor, peak memory and speaker similarity of fp32 and int8 inference
+
+Usage:
+    python benchmark_quantization.py
+    python benchmark_quantization.py --samples samples/ --runs 3 --output quantization_report.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from metrics import peak_rss_bytes
+from quantization import QUANTIZATION_MODES
+
+MODEL_NAME = "tts_models/multilingual/multi-dataset/xtts_v2"
+DEFAULT_TEXT = (
+    "The quick brown fox jumps over the lazy dog. "
+    "Voice cloning turns a few seconds of speech into a reusable voice."
+)
+SAMPLE_LANGUAGES = {
+    "en": "en", "de": "de", "es": "es", "fr": "fr", "ja": "ja",
+    "pt": "pt", "tr": "tr", "zh-cn": "zh-cn",
+}
+
+
+def sample_language(path):
+    """Language of a bundled sample from its file name (en_sample.wav, zh-cn-sample.wav)"""
+    stem = Path(path).stem
+    for prefix in sorted(SAMPLE_LANGUAGES, key=len, reverse=True):
+        if stem.startswith(prefix):
+            return SAMPLE_LANGUAGES[prefix]
+    return "en"
+
+
+def speaker_similarity(xtts, wav, sample_rate, reference_embedding):
+    """Cosine similarity between the speaker embedding of wav and the reference"""
+    import soundfile as sf
+    import torch
+
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
+        path = f.name
+    try:
+        sf.write(path, wav, sample_rate)
+        _, embedding = xtts.get_conditioning_latents(audio_path=[path])
+    finally:
+        os.remove(path)
+    return float(torch.nn.functional.cosine_similarity(
+        embedding.flatten(), reference_embedding.flatten(), dim=0
+    ))
+
+
+def run_variant(variant, samples, text, runs):
+    """Benchmark one quantization mode in this process and return its report"""
+    import torch
+    from pipeline import output_sample_rate, synthesize_chunk
+    from quantization import build_variants
+    from snapshot import load_xtts
+
+    started = time.perf_counter()
+    xtts, _ = load_xtts(MODEL_NAME, os.getenv("MODEL_SNAPSHOT_DIR") or None)
+    xtts = build_variants(xtts, [variant])[variant]
+    load_seconds = time.perf_counter() - started
+    sample_rate = output_sample_rate(xtts)
+
+    results = []
+    for sample in samples:
+        language = sample_language(sample)
+        latents = xtts.get_conditioning_latents(audio_path=[sample])
+        # Untimed run so one-time setup doesn't count against the first sample
+        synthesize_chunk(xtts, text, latents, language=language)
+
+        compute_seconds = 0.0
+        audio_seconds = 0.0
+        similarities = []
+        for run in range(runs):
+            torch.manual_seed(run)
+            t0 = time.perf_counter()
+            wav = synthesize_chunk(xtts, text, latents, language=language)
+            compute_seconds += time.perf_counter() - t0
+            audio_seconds += len(wav) / sample_rate
+            similarities.append(speaker_similarity(xtts, wav, sample_rate, latents[1]))
+
+        results.append({
+            "sample": Path(sample).name,
+            "language": language,
+            "rtf": round(compute_seconds / audio_seconds, 4) if audio_seconds else None,
+            "audio_seconds": round(audio_seconds / runs, 3),
+            "speaker_similarity": round(sum(similarities) / len(similarities), 4),
+        })
+
+    rtfs = [r["rtf"] for r in results if r["rtf"] is not None]
+    return {
+        "variant": variant,
+        "load_seconds": round(load_seconds, 3),
+        "peak_rss_bytes": peak_rss_bytes(),
+        "rtf_mean": round(sum(rtfs) / len(rtfs), 4) if rtfs else None,
+        "speaker_similarity_mean": round(
+            sum(r["speaker_similarity"] for r in results) / len(results), 4
+        ) if results else None,
+        "samples": results,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare fp32 and int8 XTTS inference on CPU")
+    parser.add_argument("--samples", default=str(Path(__file__).parent / "samples"),
+                        help="Directory of reference WAVs (default: bundled samples/)")
+    parser.add_argument("--variants", nargs="+", default=list(QUANTIZATION_MODES),
+                        choices=QUANTIZATION_MODES, help="Modes to compare")
+    parser.add_argument("--text", default=DEFAULT_TEXT, help="Text synthesized for every sample")
+    parser.add_argument("--runs", type=int, default=2, help="Timed runs per sample (default: 2)")
+    parser.add_argument("--output", default=None, help="Write the JSON report here")
+    parser.add_argument("--variant", default=None, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    samples = sorted(str(p) for p in Path(args.samples).glob("*.wav"))
+    if not samples:
+        print(f"❌ No WAV samples found in {args.samples}")
+        return 1
+
+    # Child mode: one variant per process so peak RSS is measured in isolation
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, samples, args.text, args.runs)))
+        return 0
+
+    reports = []
+    for variant in args.variants:
+        print(f"⏱️ Benchmarking {variant} on {len(samples)} sample(s)...")
+        child = subprocess.run(
+            [sys.executable, __file__, "--samples", args.samples, "--text", args.text,
+             "--runs", str(args.runs), "--variant", variant],
+            stdout=subprocess.PIPE, text=True
+        )
+        if child.returncode != 0:
+            print(f"❌ {variant} benchmark failed")
+            return 1
+        reports.append(json.loads(child.stdout.strip().splitlines()[-1]))
+
+    baseline = next((r for r in reports if r["variant"] == "fp32"), None)
+    for report in reports:
+        if baseline and report is not baseline and report["rtf_mean"] and baseline["rtf_mean"]:
+            report["speedup_vs_fp32"] = round(baseline["rtf_mean"] / report["rtf_mean"], 3)
+            report["memory_vs_fp32"] = round(report["peak_rss_bytes"] / baseline["peak_rss_bytes"], 3)
+            report["similarity_delta_vs_fp32"] = round(
+                report["speaker_similarity_mean"] - baseline["speaker_similarity_mean"], 4
+            )
+        print(f"📊 {report['variant']}: RTF {report['rtf_mean']}, "
+              f"peak RSS {report['peak_rss_bytes'] / 1024 ** 2:.0f} MiB, "
+              f"speaker similarity {report['speaker_similarity_mean']}")
+
+    output = json.dumps({"text": args.text, "runs": args.runs, "variants": reports}, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"✅ Report written to {args.output}")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
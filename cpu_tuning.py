@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Geria Voice Cloning CPU Tuning
+torch intra-/inter-op thread counts and CPU core pinning for inference workers
+"""
+
+import os
+
+import torch
+
+
+def parse_cpu_list(spec):
+    """Parse a Linux-style CPU list ("0-3,8,10-11") into sorted core ids"""
+    cpus = set()
+    for part in (p.strip() for p in (spec or "").split(",")):
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-", 1)
+            cpus.update(range(int(first), int(last) + 1))
+        else:
+            cpus.add(int(part))
+    return sorted(cpus)
+
+
+def available_cpus():
+    """Cores this process may run on"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def split_cpus(cpus, workers):
+    """Divide cores into one contiguous, near-equal set per worker"""
+    workers = max(1, min(workers, len(cpus)))
+    size, extra = divmod(len(cpus), workers)
+    sets, start = [], 0
+    for i in range(workers):
+        end = start + size + (1 if i < extra else 0)
+        sets.append(cpus[start:end])
+        start = end
+    return sets
+
+
+def default_intra_op_threads(concurrency=1, cpus=None):
+    """Intra-op threads per concurrent model call so calls don't oversubscribe cores"""
+    cores = len(cpus) if cpus else torch.get_num_threads()
+    return max(1, cores // max(1, concurrency))
+
+
+def pin_cpus(cpus):
+    """Restrict the calling process to cpus; False where unsupported"""
+    if not cpus or not hasattr(os, "sched_setaffinity"):
+        return False
+    os.sched_setaffinity(0, cpus)
+    return True
+
+
+def configure_threads(intra_op=None, inter_op=None):
+    """Set torch's thread pools; None leaves a setting at torch's default
+
+    The inter-op pool can only be sized before its first use, so a late
+    call keeps the current size and logs a warning instead of failing.
+    """
+    if intra_op:
+        torch.set_num_threads(intra_op)
+    if inter_op:
+        try:
+            torch.set_num_interop_threads(inter_op)
+        except RuntimeError as e:
+            print(f"⚠️ Could not set inter-op threads to {inter_op}: {str(e)}")
+
+
+def thread_stats():
+    """Effective thread and affinity settings of this process"""
+    return {
+        "intra_op_threads": torch.get_num_threads(),
+        "inter_op_threads": torch.get_num_interop_threads(),
+        "cpus": available_cpus(),
+    }
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Geria Voice Cloning Audio Encoding
+In-process WAV / FLAC / Opus / MP3 encoding of generated audio
+"""
+
+import inspect
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import soundfile as sf
+
+# extension, libsndfile container/codec, HTTP media type, the bitrate range
+# (kbps) that libsndfile's compression level is spread over and its bitrate mode.
+# MP3 at the 24 kHz XTTS rate is MPEG-2 Layer III, which tops out at 160 kbps;
+# without CONSTANT libsndfile encodes VBR and ignores the requested bitrate.
+OUTPUT_FORMATS = {
+    "wav": {"extension": "wav", "format": "WAV", "subtype": "PCM_16", "media_type": "audio/wav",
+            "kbps": None, "bitrate_mode": None},
+    "flac": {"extension": "flac", "format": "FLAC", "subtype": "PCM_16", "media_type": "audio/flac",
+             "kbps": None, "bitrate_mode": None},
+    "opus": {"extension": "ogg", "format": "OGG", "subtype": "OPUS", "media_type": "audio/ogg",
+             "kbps": (6, 256), "bitrate_mode": None},
+    "mp3": {"extension": "mp3", "format": "MP3", "subtype": "MPEG_LAYER_III", "media_type": "audio/mpeg",
+            "kbps": (8, 160), "bitrate_mode": "CONSTANT"},
+}
+
+# libsndfile rejects a compression level of exactly 1.0 for MP3
+MAX_COMPRESSION_LEVEL = 0.999
+
+MEDIA_TYPES = {spec["extension"]: spec["media_type"] for spec in OUTPUT_FORMATS.values()}
+
+# soundfile < 0.13 cannot set a compression level or bitrate mode; bitrates are ignored there
+SUPPORTS_COMPRESSION_LEVEL = "compression_level" in inspect.signature(sf.write).parameters
+
+
+def validate_format(output_format):
+    """Raise ValueError for unsupported output formats"""
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format '{output_format}', expected one of {sorted(OUTPUT_FORMATS)}")
+
+
+def validate_bitrate(output_format, bitrate):
+    """Raise ValueError for a bitrate outside the format's range (ignored for lossless formats)"""
+    kbps = OUTPUT_FORMATS[output_format]["kbps"]
+    if bitrate is None or not kbps:
+        return
+    low, high = kbps
+    if not low <= bitrate <= high:
+        raise ValueError(f"Bitrate for {output_format} must be between {low} and {high} kbps, got {bitrate}")
+
+
+def file_extension(output_format):
+    """File extension used for an output format"""
+    return OUTPUT_FORMATS[output_format]["extension"]
+
+
+def media_type_for(file_name):
+    """HTTP media type for a generated file"""
+    extension = os.path.splitext(file_name)[1].lstrip(".").lower()
+    return MEDIA_TYPES.get(extension, "application/octet-stream")
+
+
+def wav_size(num_samples):
+    """Size of the equivalent mono 16-bit PCM WAV file"""
+    return 44 + 2 * num_samples
+
+
+def _compression_level(output_format, bitrate):
+    """Map a target bitrate (kbps) onto libsndfile's 0 (best) .. 1 (smallest) scale"""
+    kbps = OUTPUT_FORMATS[output_format]["kbps"]
+    if not bitrate or not kbps:
+        return None
+    low, high = kbps
+    return min((high - bitrate) / (high - low), MAX_COMPRESSION_LEVEL)
+
+
+def encode_audio(wav, sample_rate, output_format="wav", bitrate=None):
+    """Encode a float waveform to bytes in the requested format"""
+    validate_format(output_format)
+    validate_bitrate(output_format, bitrate)
+    spec = OUTPUT_FORMATS[output_format]
+    options = {}
+    level = _compression_level(output_format, bitrate)
+    if level is not None and SUPPORTS_COMPRESSION_LEVEL:
+        options["compression_level"] = level
+        if spec["bitrate_mode"]:
+            options["bitrate_mode"] = spec["bitrate_mode"]
+
+    buffer = io.BytesIO()
+    sf.write(buffer, wav, sample_rate, format=spec["format"], subtype=spec["subtype"], **options)
+    return buffer.getvalue()
+
+
+def encode_to_file(path, wav, sample_rate, output_format="wav", bitrate=None):
+    """Encode a waveform to path; returns (encoded bytes, equivalent WAV bytes)"""
+    data = encode_audio(wav, sample_rate, output_format, bitrate)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data), wav_size(len(wav))
+
+
+# Encoding runs here so it overlaps with synthesis of the next chunk
+encoder_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("ENCODER_THREADS", 2)),
+    thread_name_prefix="encoder"
+)
@@ -193,8 +193,8 @@ def check_backend_status():
         "ready": False
     }
 
-def process_voice_cloning_api(text_content, speaker_files, voice_mode):
-    """Send voice cloning request to backend API"""
+def process_voice_cloning_api(text_content, speaker_files, voice_mode, poll_interval=2):
+    """Submit a voice cloning job to the backend and wait for it to finish"""
     try:
         # Prepare files for upload
         files = []
@@ -207,24 +207,47 @@ def process_voice_cloning_api(text_content, speaker_files, voice_mode):
             'voice_mode': voice_mode
         }
         
-        # Send request to backend
+        # Submit job; the backend answers as soon as it is queued
         response = requests.post(
-            f"{BACKEND_URL}/process-voice",
+            f"{BACKEND_URL}/jobs",
             data=data,
             files=files,
-            timeout=300  # 5 minutes timeout
+            timeout=60
         )
         
-        if response.status_code == 200:
-            result = response.json()
-            return result
-        else:
+        if response.status_code != 202:
             error_detail = response.json().get("detail", "Unknown error")
             st.error(f"Backend error: {error_detail}")
             return None
+        
+        status_path = response.json()["status_path"]
+        progress_bar = st.progress(0)
+        
+        # Poll until the job completes or fails
+        while True:
+            time.sleep(poll_interval)
+            try:
+                response = requests.get(f"{BACKEND_URL}{status_path}", timeout=10)
+            except requests.exceptions.ConnectionError:
+                # Backend restarting; the job is journaled and resumes when it is back
+                continue
+            if response.status_code != 200:
+                st.error(f"Backend error: {response.json().get('detail', 'Unknown error')}")
+                return None
+            
+            job = response.json()
+            if job["chunks_total"]:
+                progress_bar.progress(job["chunks_done"] / job["chunks_total"])
+            
+            if job["status"] == "completed":
+                progress_bar.progress(1.0)
+                return job
+            if job["status"] == "failed":
+                st.error(f"Backend error: {job.get('error') or 'Unknown error'}")
+                return None
             
     except requests.exceptions.Timeout:
-        st.error("Request timed out. The processing is taking longer than expected.")
+        st.error("Request timed out. The backend is not responding.")
         return None
     except Exception as e:
         st.error(f"Error communicating with backend: {str(e)}")
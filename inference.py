@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Geria Voice Cloning Inference Executor
+Runs blocking synthesis off the event loop with a bounded concurrency
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class InferenceExecutor:
+    """Thread pool for model calls that tracks queue wait and compute time"""
+
+    def __init__(self, max_workers=1):
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="inference"
+        )
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.active = 0
+        self.completed = 0
+        self.queue_seconds = 0.0
+        self.compute_seconds = 0.0
+
+    def submit(self, fn, *args, **kwargs):
+        """Schedule fn on the pool and return a concurrent.futures.Future"""
+        queued_at = time.perf_counter()
+        with self._lock:
+            self.pending += 1
+
+        def timed_call():
+            started_at = time.perf_counter()
+            with self._lock:
+                self.pending -= 1
+                self.active += 1
+                self.queue_seconds += started_at - queued_at
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    self.completed += 1
+                    self.compute_seconds += time.perf_counter() - started_at
+
+        future = self._pool.submit(timed_call)
+        future.add_done_callback(self._forget_cancelled)
+        return future
+
+    def _forget_cancelled(self, future):
+        """A call cancelled before it started never leaves the pending count otherwise"""
+        if future.cancelled():
+            with self._lock:
+                self.pending -= 1
+
+    def stats(self):
+        """Concurrency and timing counters for status reporting"""
+        with self._lock:
+            completed = self.completed
+            return {
+                "max_concurrency": self.max_workers,
+                "pending": self.pending,
+                "active": self.active,
+                "completed": completed,
+                "queue_seconds_total": round(self.queue_seconds, 3),
+                "compute_seconds_total": round(self.compute_seconds, 3),
+                "queue_seconds_avg": round(self.queue_seconds / completed, 3) if completed else 0.0,
+                "compute_seconds_avg": round(self.compute_seconds / completed, 3) if completed else 0.0,
+            }
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Geria Voice Cloning Job Queue
+Bounded queue of synthesis jobs served by a pool of worker threads
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue has no room for another job"""
+
+
+class JobJournal:
+    """Durable SQLite record of jobs and their finished chunks"""
+
+    def __init__(self, db_path, retention=24 * 3600):
+        self.db_path = db_path
+        self.retention = retention
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                params TEXT NOT NULL,
+                status TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result TEXT,
+                error TEXT
+            )"""
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS job_chunks (
+                job_id TEXT NOT NULL,
+                file_name TEXT NOT NULL,
+                key TEXT NOT NULL,
+                bytes INTEGER NOT NULL,
+                wav_bytes INTEGER NOT NULL,
+                PRIMARY KEY (job_id, file_name)
+            )"""
+        )
+        self._conn.commit()
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            self._conn.commit()
+        return rows
+
+    def add(self, job):
+        """Record a newly submitted job"""
+        self._execute(
+            "INSERT OR REPLACE INTO jobs (job_id, params, status, created_at) VALUES (?, ?, ?, ?)",
+            (job.id, json.dumps(job.params), job.status, job.created_at)
+        )
+
+    def remove(self, job_id):
+        """Forget a job and its chunks"""
+        with self._lock:
+            self._conn.execute("DELETE FROM job_chunks WHERE job_id = ?", (job_id,))
+            self._conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+            self._conn.commit()
+
+    def started(self, job):
+        """Record that a worker picked the job up"""
+        self._execute(
+            "UPDATE jobs SET status = ?, started_at = ?, attempts = ? WHERE job_id = ?",
+            (job.status, job.started_at, job.attempts, job.id)
+        )
+
+    def finished(self, job):
+        """Record a job's final status and result"""
+        self._execute(
+            "UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = ? WHERE job_id = ?",
+            (job.status, job.finished_at, json.dumps(job.result), job.error, job.id)
+        )
+
+    def record_chunk(self, job_id, file_name, key, encoded_bytes, wav_bytes):
+        """Record one chunk whose output file is complete on disk"""
+        self._execute(
+            "INSERT OR REPLACE INTO job_chunks (job_id, file_name, key, bytes, wav_bytes) VALUES (?, ?, ?, ?, ?)",
+            (job_id, file_name, key, encoded_bytes, wav_bytes)
+        )
+
+    def completed_chunks(self, job_id):
+        """Map file name -> chunk record for the finished chunks of a job"""
+        rows = self._execute(
+            "SELECT file_name, key, bytes, wav_bytes FROM job_chunks WHERE job_id = ?",
+            (job_id,)
+        )
+        return {
+            file_name: {"key": key, "bytes": encoded, "wav_bytes": wav}
+            for file_name, key, encoded, wav in rows
+        }
+
+    def load(self):
+        """Every retained job in submission order, dropping expired finished ones"""
+        cutoff = time.time() - self.retention
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM job_chunks WHERE job_id IN "
+                "(SELECT job_id FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?)",
+                (cutoff,)
+            )
+            self._conn.execute("DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (cutoff,))
+            self._conn.commit()
+            rows = self._conn.execute(
+                """SELECT job_id, params, status, created_at, started_at, finished_at, attempts, result, error,
+                          (SELECT COUNT(*) FROM job_chunks c WHERE c.job_id = jobs.job_id)
+                   FROM jobs ORDER BY created_at"""
+            ).fetchall()
+        jobs = []
+        for job_id, params, status, created_at, started_at, finished_at, attempts, result, error, chunks in rows:
+            job = Job(json.loads(params), job_id, journal=self)
+            job.status = status
+            job.created_at = created_at
+            job.started_at = started_at
+            job.finished_at = finished_at
+            job.attempts = attempts
+            job.result = json.loads(result) if result else None
+            job.error = error
+            job.chunks_done = chunks
+            jobs.append(job)
+        return jobs
+
+
+class Job:
+    """A single voice cloning job and its progress"""
+
+    def __init__(self, params, job_id=None, journal=None):
+        self.id = job_id or uuid.uuid4().hex
+        self.params = params
+        self.journal = journal
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.attempts = 0
+        self.chunks_done = 0
+        self.chunks_total = 0
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+        self._callbacks = []
+        self._callbacks_lock = threading.Lock()
+
+    def add_done_callback(self, fn):
+        """Call fn(job) once the job has finished, right away if it already has"""
+        with self._callbacks_lock:
+            if not self.done.is_set():
+                self._callbacks.append(fn)
+                return
+        fn(self)
+
+    def finish(self):
+        """Mark the job finished and run its done-callbacks"""
+        with self._callbacks_lock:
+            self.done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            fn(self)
+
+    def set_progress(self, done, total):
+        """Record how many chunks have been synthesized"""
+        self.chunks_done = done
+        self.chunks_total = total
+
+    def record_chunk(self, file_name, key, encoded_bytes, wav_bytes):
+        """Journal a finished chunk so a restarted backend can skip it"""
+        if self.journal:
+            self.journal.record_chunk(self.id, file_name, key, encoded_bytes, wav_bytes)
+
+    def completed_chunks(self):
+        """Chunks finished by earlier attempts of this job"""
+        return self.journal.completed_chunks(self.id) if self.journal else {}
+
+    def to_dict(self):
+        """Public view of the job for status endpoints"""
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "attempts": self.attempts,
+            "chunks_done": self.chunks_done,
+            "chunks_total": self.chunks_total,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """Runs submitted jobs on a fixed number of worker threads
+
+    With a journal, jobs survive restarts: restore() re-queues every job that
+    was queued or running when the previous process stopped.
+    """
+
+    def __init__(self, handler, workers=1, max_queue=16, journal=None, max_attempts=3,
+                 retention=24 * 3600):
+        self.handler = handler
+        self.workers = workers
+        self.max_queue = max_queue
+        self.journal = journal
+        self.max_attempts = max_attempts
+        self.retention = retention
+        self.jobs = {}
+        self.recovered = 0
+        self._queue = queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._running = 0
+
+    def start(self):
+        """Start the worker threads (idempotent)"""
+        if self._threads:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._worker_loop,
+                name=f"voice-worker-{i+1}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def restore(self):
+        """Re-attach journaled jobs; unfinished ones run once workers start"""
+        if not self.journal:
+            return
+        for job in self.journal.load():
+            with self._lock:
+                self.jobs[job.id] = job
+            if job.status in ("completed", "failed"):
+                job.finish()
+                continue
+            if job.attempts >= self.max_attempts:
+                # The job keeps taking the process down with it; stop retrying
+                job.status = "failed"
+                job.error = f"Gave up after {job.attempts} interrupted attempts"
+                job.finished_at = time.time()
+                self.journal.finished(job)
+                job.finish()
+                continue
+            job.status = "queued"
+            self._queue.put(job)
+            self.recovered += 1
+        if self.recovered:
+            print(f"♻️ Re-attached {self.recovered} interrupted job(s)")
+
+    def prune(self):
+        """Forget jobs that finished more than retention seconds ago"""
+        cutoff = time.time() - self.retention
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self.jobs.items()
+                if job.finished_at is not None and job.finished_at < cutoff
+            ]
+            for job_id in expired:
+                del self.jobs[job_id]
+        if self.journal:
+            for job_id in expired:
+                self.journal.remove(job_id)
+        return len(expired)
+
+    def claim(self, job_id=None, fingerprint=None):
+        """Reserve a job id atomically; returns (job, created)
+
+        An existing job with the id is returned as is unless it failed, in
+        which case a new job replaces it so the request can be retried. A new
+        job stays "preparing" until enqueue() or release().
+        """
+        self.prune()
+        with self._lock:
+            job = self.jobs.get(job_id) if job_id else None
+            if job and job.status != "failed":
+                return job, False
+            replaced = job is not None
+            job = Job({"fingerprint": fingerprint}, job_id, journal=self.journal)
+            job.status = "preparing"
+            self.jobs[job.id] = job
+        if replaced and self.journal:
+            self.journal.remove(job.id)
+        return job, True
+
+    def enqueue(self, job, params):
+        """Queue a claimed job, raising QueueFullError when the queue is at capacity"""
+        with self._lock:
+            if self._queue.qsize() >= self.max_queue:
+                raise QueueFullError(f"Job queue is full ({self.max_queue} jobs waiting)")
+            job.params = dict(params, fingerprint=job.params.get("fingerprint"))
+            job.status = "queued"
+            if self.journal:
+                self.journal.add(job)
+            self._queue.put(job)
+        return job
+
+    def release(self, job, error):
+        """Fail a claimed job that could not be queued and free its id"""
+        with self._lock:
+            if self.jobs.get(job.id) is job:
+                del self.jobs[job.id]
+        job.status = "failed"
+        job.error = error
+        job.finished_at = time.time()
+        job.finish()
+
+    def get(self, job_id):
+        """Look up a job by id"""
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def active_ids(self):
+        """Ids of jobs that are being prepared, queued or running"""
+        with self._lock:
+            return {
+                job_id for job_id, job in self.jobs.items()
+                if job.status in ("preparing", "queued", "running")
+            }
+
+    def _worker_loop(self):
+        while True:
+            job = self._queue.get()
+            with self._lock:
+                self._running += 1
+            job.status = "running"
+            job.started_at = time.time()
+            job.attempts += 1
+            try:
+                if self.journal:
+                    self.journal.started(job)
+                job.result = self.handler(job)
+                job.status = "completed"
+            except Exception as e:
+                traceback.print_exc()
+                job.error = str(e)
+                job.status = "failed"
+            finally:
+                job.finished_at = time.time()
+                if self.journal:
+                    try:
+                        self.journal.finished(job)
+                    except Exception as e:
+                        print(f"⚠️ Could not journal job {job.id}: {str(e)}")
+                with self._lock:
+                    self._running -= 1
+                job.finish()
+                self._queue.task_done()
+
+    def stats(self):
+        """Queue counters for status reporting"""
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "queued": self._queue.qsize(),
+            "running": self._running,
+            "durable": self.journal is not None,
+            "recovered": self.recovered,
+        }
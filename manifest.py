@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Geria Voice Cloning Job Manifests
+Per-job record of every chunk, used to re-synthesize only what changed
+"""
+
+import json
+import os
+import shutil
+import time
+
+MANIFEST_NAME = "manifest.json"
+
+
+def write_manifest(job_dir, speaker_key, language, output_format, bitrate, chunks):
+    """Write the manifest of a finished job
+
+    chunks is a list of dicts with file_name, paragraph, part, key, path,
+    bytes (encoded size) and wav_bytes (equivalent WAV size).
+    """
+    manifest = {
+        "created_at": time.time(),
+        "speaker_key": speaker_key,
+        "language": language,
+        "output_format": output_format,
+        "bitrate": bitrate,
+        "chunks": chunks,
+    }
+    path = os.path.join(job_dir, MANIFEST_NAME)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_path, path)
+    return manifest
+
+
+def load_manifest(job_dir):
+    """Manifest of a job, or None if it has none"""
+    path = os.path.join(job_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def reusable_outputs(manifest, output_format, bitrate):
+    """Map chunk key -> manifest entry for outputs that can be reused as-is"""
+    if not manifest:
+        return {}
+    if manifest["output_format"] != output_format or manifest["bitrate"] != bitrate:
+        return {}
+    return {
+        chunk["key"]: chunk
+        for chunk in manifest["chunks"]
+        if os.path.exists(chunk["path"])
+    }
+
+
+def reuse_output(source, destination):
+    """Place a previous job's output at destination, hard-linking when possible"""
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Geria Voice Cloning Pipeline
+Synthesis helpers shared by the backend and the batch tools
+"""
+
+import io
+
+import numpy as np
+import soundfile as sf
+import torch
+
+
+def get_xtts(model):
+    """Return the underlying Xtts model from a TTS api wrapper (or the model itself)"""
+    synthesizer = getattr(model, "synthesizer", None)
+    if synthesizer is not None:
+        return synthesizer.tts_model
+    return model
+
+
+def output_sample_rate(xtts):
+    """Sample rate of the audio produced by the model"""
+    return xtts.config.audio.output_sample_rate
+
+
+def conditioning_sample_rate(xtts):
+    """Sample rate XTTS loads reference audio at for conditioning"""
+    return getattr(xtts.config.audio, "sample_rate", 22050)
+
+
+def inference_settings(xtts):
+    """Sampling parameters, taken from the model config like TTS.synthesize does"""
+    config = xtts.config
+    return {
+        "temperature": config.temperature,
+        "length_penalty": config.length_penalty,
+        "repetition_penalty": config.repetition_penalty,
+        "top_k": config.top_k,
+        "top_p": config.top_p,
+    }
+
+
+def synthesize_chunk(xtts, text, latents, language="en", split_sentences=False):
+    """Synthesize one text chunk from precomputed conditioning latents
+
+    Chunks come from segmentation.plan_chunks already sentence-aligned and
+    within the tokenizer budget, so XTTS' own sentence splitting stays off.
+    """
+    gpt_cond_latent, speaker_embedding = latents
+    with torch.inference_mode():
+        out = xtts.inference(
+            text,
+            language,
+            gpt_cond_latent,
+            speaker_embedding,
+            enable_text_splitting=split_sentences,
+            **inference_settings(xtts)
+        )
+    return np.asarray(out["wav"], dtype=np.float32)
+
+
+def stream_chunk(xtts, text, latents, language="en", stream_chunk_size=20):
+    """Yield audio segments for one chunk while the GPT decoder is still generating"""
+    gpt_cond_latent, speaker_embedding = latents
+    with torch.inference_mode():
+        for segment in xtts.inference_stream(
+            text,
+            language,
+            gpt_cond_latent,
+            speaker_embedding,
+            stream_chunk_size=stream_chunk_size,
+            enable_text_splitting=False,
+            **inference_settings(xtts)
+        ):
+            yield segment.cpu().numpy().astype(np.float32)
+
+
+def wav_bytes(wav, sample_rate):
+    """Encode a float waveform as an in-memory 16-bit PCM WAV file"""
+    buffer = io.BytesIO()
+    sf.write(buffer, wav, sample_rate, format="WAV", subtype="PCM_16")
+    return buffer.getvalue()
+
+
+def pcm16_bytes(wav):
+    """Convert a float waveform to raw little-endian 16-bit PCM"""
+    return (np.clip(wav, -1.0, 1.0) * 32767).astype("<i2").tobytes()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Geria Voice Cloning Pre-fork Workers
+Inference processes forked after model load so they share weights copy-on-write
+"""
+
+import gc
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from cpu_tuning import available_cpus, configure_threads, pin_cpus
+from pipeline import synthesize_chunk
+
+# Set in the parent right before forking; children inherit them without a copy
+_models = {}
+
+
+def _init_worker(threads, cpu_sets):
+    """Set the thread counts (and core set, if pinning) of a freshly forked worker"""
+    cpus = None
+    if cpu_sets:
+        # Pool workers are numbered from 1; a rebuilt pool keeps counting up
+        index = (multiprocessing.current_process()._identity[0] - 1) % len(cpu_sets)
+        cpus = cpu_sets[index]
+        pin_cpus(cpus)
+    # The inter-op pool size is inherited from the parent, which set it before forking
+    configure_threads(threads)
+    pinned = f", pinned to CPUs {cpus[0]}-{cpus[-1]}" if cpus else ""
+    print(f"🧵 Inference worker {os.getpid()} started with {threads} threads{pinned}")
+
+
+def _synthesize_in_worker(text, latents, language, variant):
+    return synthesize_chunk(_models[variant], text, latents, language=language)
+
+
+class PreforkPool:
+    """Pool of forked inference processes sharing the parent's model weights
+
+    start() must run before the process starts any other thread: a child
+    forked while another thread holds a lock would inherit it locked.
+    """
+
+    def __init__(self, processes, threads_per_worker=None, cpu_sets=None):
+        self.processes = processes
+        self.cpu_sets = cpu_sets
+        self.threads_per_worker = threads_per_worker or max(
+            1, len(cpu_sets[0]) if cpu_sets else len(available_cpus()) // processes
+        )
+        self.restarts = 0
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @property
+    def started(self):
+        return self._pool is not None
+
+    def _fork(self):
+        pool = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker,
+            initargs=(self.threads_per_worker, self.cpu_sets)
+        )
+        # With fork, the first submit forks every worker before the pool's
+        # own management thread starts
+        pool.submit(os.getpid).result()
+        return pool
+
+    def start(self, models):
+        """Fork the workers; call once the models are loaded and before any other thread starts
+
+        models maps a variant name (e.g. "fp32", "int8") to an Xtts model.
+        """
+        if self._pool is not None:
+            return
+        _models.update(models)
+        for xtts in models.values():
+            xtts.eval()
+        # Move surviving objects out of the collector's reach so its
+        # bookkeeping writes don't un-share pages in the children
+        gc.collect()
+        gc.freeze()
+        self._pool = self._fork()
+        print(f"🍴 Forked {self.processes} inference workers")
+
+    def close(self):
+        """Stop the workers"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def synthesize(self, text, latents, language="en", variant="fp32"):
+        """Synthesize one chunk on one of the workers (blocking)
+
+        A worker that dies (e.g. killed for memory) breaks the pool: the call
+        raises BrokenProcessPool instead of hanging, and the workers are
+        forked again for later calls.
+        """
+        pool = self._pool
+        try:
+            return pool.submit(_synthesize_in_worker, text, latents, language, variant).result()
+        except BrokenProcessPool:
+            self._restart(pool)
+            raise
+
+    def _restart(self, broken):
+        """Replace a broken pool (once, however many callers saw it break)"""
+        with self._lock:
+            if self._pool is not broken:
+                return
+            # Other threads are running by now; this is a recovery path only
+            print("⚠️ An inference worker died; forking the workers again")
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._pool = self._fork()
+            self.restarts += 1
+
+    def stats(self):
+        """Worker layout for status reporting"""
+        return {
+            "processes": self.processes,
+            "threads_per_worker": self.threads_per_worker,
+            "cpu_sets": self.cpu_sets,
+            "started": self.started,
+            "restarts": self.restarts,
+        }
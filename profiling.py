@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Geria Voice Cloning Profiling
+Opt-in cProfile / torch profiler capture of a single job
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import threading
+
+# Trace file and text summary written into the job directory per mode
+PROFILE_FILES = {
+    "cprofile": "profile.prof",
+    "torch": "profile_trace.json",
+}
+SUMMARY_NAME = "profile.txt"
+
+_TRUE = {"1", "true", "yes", "on", "cprofile"}
+_FALSE = {"", "0", "false", "no", "off"}
+
+# Profilers hook the whole interpreter on recent Pythons, so traces are
+# only meaningful (and cProfile only allowed) one job at a time
+_lock = threading.Lock()
+
+
+def parse_profile_mode(value):
+    """Normalize a header/form value to None, "cprofile" or "torch"
+
+    Raises ValueError for anything else.
+    """
+    value = (value or "").strip().lower()
+    if value in _FALSE:
+        return None
+    if value in _TRUE:
+        return "cprofile"
+    if value == "torch":
+        return "torch"
+    raise ValueError(f"Unknown profile mode: {value} (expected cprofile or torch)")
+
+
+def profile_call(mode, output_dir, fn, *args, **kwargs):
+    """Run fn under the profiler for mode and store its trace in output_dir
+
+    The trace and a top-50 summary are written even when fn raises.
+    """
+    with _lock:
+        if mode == "torch":
+            return _torch_profile(output_dir, fn, *args, **kwargs)
+        return _cprofile(output_dir, fn, *args, **kwargs)
+
+
+def _cprofile(output_dir, fn, *args, **kwargs):
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        profiler.disable()
+        profiler.dump_stats(os.path.join(output_dir, PROFILE_FILES["cprofile"]))
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(50)
+        _write_summary(output_dir, summary.getvalue())
+
+
+def _torch_profile(output_dir, fn, *args, **kwargs):
+    from torch.profiler import ProfilerActivity, profile
+
+    profiler = profile(activities=[ProfilerActivity.CPU], record_shapes=True)
+    profiler.start()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        profiler.stop()
+        profiler.export_chrome_trace(os.path.join(output_dir, PROFILE_FILES["torch"]))
+        _write_summary(
+            output_dir,
+            profiler.key_averages().table(sort_by="self_cpu_time_total", row_limit=50)
+        )
+
+
+def _write_summary(output_dir, text):
+    with open(os.path.join(output_dir, SUMMARY_NAME), "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def find_trace(job_dir):
+    """(path, mode) of the trace stored in a job directory, or (None, None)"""
+    for mode, name in PROFILE_FILES.items():
+        path = os.path.join(job_dir, name)
+        if os.path.exists(path):
+            return path, mode
+    return None, None
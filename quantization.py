@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Geria Voice Cloning Quantization
+Int8 dynamic quantization of the XTTS GPT decoder for faster CPU inference
+"""
+
+import copy
+
+import torch
+
+# fp32 is the model as loaded; int8 swaps the GPT decoder's linear layers
+# for dynamically quantized ones (weights int8, activations quantized per call)
+QUANTIZATION_MODES = ("fp32", "int8")
+
+
+def validate_quantization(mode):
+    """Raise ValueError for an unknown quantization mode"""
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"Unknown quantization: {mode} (expected one of {', '.join(QUANTIZATION_MODES)})")
+    return mode
+
+
+def _conv1d_to_linear(module):
+    """Replace HF GPT-2 Conv1D layers (transposed linears) with nn.Linear in place
+
+    quantize_dynamic only recognizes nn.Linear, and GPT-2's attention and MLP
+    projections are Conv1D, so without this nothing in the decoder is quantized.
+    """
+    for name, child in module.named_children():
+        if type(child).__name__ == "Conv1D":
+            in_features, out_features = child.weight.shape
+            linear = torch.nn.Linear(in_features, out_features, bias=child.bias is not None)
+            with torch.no_grad():
+                linear.weight.copy_(child.weight.t())
+                if child.bias is not None:
+                    linear.bias.copy_(child.bias)
+            setattr(module, name, linear)
+        else:
+            _conv1d_to_linear(child)
+
+
+def quantize_int8(xtts, inplace=False):
+    """Return an Xtts model whose GPT decoder runs int8 dynamic quantized
+
+    With inplace=False the fp32 model is left untouched and shares every
+    module except the GPT decoder with the returned copy.
+    """
+    gpt = xtts.gpt if inplace else copy.deepcopy(xtts.gpt)
+    _conv1d_to_linear(gpt)
+    torch.ao.quantization.quantize_dynamic(gpt, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    gpt.eval()
+
+    if inplace:
+        return xtts
+    quantized = copy.copy(xtts)
+    quantized._modules = dict(xtts._modules)
+    quantized._modules["gpt"] = gpt
+    return quantized
+
+
+def build_variants(xtts, modes):
+    """Map each requested quantization mode to a model built from xtts
+
+    When fp32 is not among the modes the model is quantized in place, so
+    no fp32 copy of the decoder stays resident.
+    """
+    modes = [validate_quantization(mode) for mode in modes]
+    variants = {}
+    if "fp32" in modes:
+        variants["fp32"] = xtts
+    if "int8" in modes:
+        variants["int8"] = quantize_int8(xtts, inplace="fp32" not in modes)
+    return variants
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Geria Voice Cloning Result Cache
+Content-addressed store of synthesized chunk audio with LRU eviction
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+
+import numpy as np
+
+
+def normalize_text(text):
+    """Canonical form of chunk text for cache keys"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(text, speaker_key, language, model_version, settings):
+    """Key for one synthesized chunk"""
+    payload = json.dumps({
+        "text": normalize_text(text),
+        "speaker": speaker_key,
+        "language": language,
+        "model": model_version,
+        "settings": settings,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SynthesisResultCache:
+    """Persistent waveform cache bounded by total bytes on disk"""
+
+    def __init__(self, cache_dir, max_bytes=1024 ** 3):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(cache_dir, "index.db"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                bytes INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.npy")
+
+    def get(self, key):
+        """Cached waveform for key, or None"""
+        path = self._path(key)
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM results WHERE key = ?", (key,)).fetchone()
+            if row:
+                self._conn.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+                self._conn.commit()
+        if row:
+            try:
+                wav = np.load(path)
+                self.hits += 1
+                return wav
+            except (OSError, ValueError):
+                self._forget(key)
+        self.misses += 1
+        return None
+
+    def put(self, key, wav):
+        """Store a waveform and evict least recently used entries over budget"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, np.asarray(wav, dtype=np.float32))
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, bytes, last_access) VALUES (?, ?, ?)",
+                (key, os.path.getsize(path), time.time())
+            )
+            self._conn.commit()
+        self._evict()
+
+    def _forget(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            self._conn.commit()
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        with self._lock:
+            used = self._conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM results").fetchone()[0]
+            if used <= self.max_bytes:
+                return
+            rows = self._conn.execute("SELECT key, bytes FROM results ORDER BY last_access").fetchall()
+        for key, size in rows:
+            if used <= self.max_bytes:
+                break
+            self._forget(key)
+            self.evictions += 1
+            used -= size
+
+    def stats(self):
+        """Cache counters for status reporting"""
+        with self._lock:
+            entries, used = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM results"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "bytes": used,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
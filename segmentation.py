@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Geria Voice Cloning Segmentation
+Single-pass, sentence-aligned text chunking sized for XTTS
+"""
+
+import re
+
+# Per-language character budgets used by the XTTS tokenizer
+# (VoiceBpeTokenizer.char_limits); the model warns and may truncate beyond them
+DEFAULT_CHAR_LIMITS = {
+    "en": 250, "de": 253, "fr": 273, "es": 239, "it": 213, "pt": 203,
+    "pl": 224, "zh": 82, "zh-cn": 82, "ar": 166, "cs": 186, "ru": 182,
+    "nl": 251, "tr": 226, "ja": 71, "hu": 224, "ko": 95,
+}
+
+_PARAGRAPH_RE = re.compile(r"Paragraph\s+(\d+):\s*(.*?)(?=Paragraph\s+\d+:|$)", re.DOTALL)
+_SENTENCE_RE = re.compile(r"(?<=[.!?…])\s+|(?<=[。！？])")
+_CLAUSE_RE = re.compile(r"(?<=[,;:，、；])\s*")
+_CJK_RE = re.compile(r"[\u3000-\u9fff\uac00-\ud7af\uff00-\uffef]")
+
+
+def _join(left, right):
+    """Join two pieces, without a space between CJK text"""
+    if not left:
+        return right
+    if _CJK_RE.match(left[-1]) or _CJK_RE.match(right[0]):
+        return left + right
+    return f"{left} {right}"
+
+
+def extract_paragraphs(text):
+    """Extract (number, text) paragraphs from "Paragraph N:" markers or blank lines"""
+    paragraphs = _PARAGRAPH_RE.findall(text)
+
+    if not paragraphs:
+        text_paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
+        paragraphs = [(i+1, p) for i, p in enumerate(text_paragraphs)]
+
+    return paragraphs
+
+
+def char_limit(language="en", xtts=None):
+    """Character budget for one chunk, from the model's tokenizer when available"""
+    tokenizer = getattr(xtts, "tokenizer", None)
+    limits = getattr(tokenizer, "char_limits", None) or DEFAULT_CHAR_LIMITS
+    return limits.get(language, limits.get(language.split("-")[0], 250))
+
+
+def split_sentences(text):
+    """Split text after sentence-final punctuation"""
+    return [s.strip() for s in _SENTENCE_RE.split(text) if s.strip()]
+
+
+def _split_long(sentence, max_chars):
+    """Break a sentence over budget at clause boundaries, then between words"""
+    pieces = []
+    for clause in (c for c in _CLAUSE_RE.split(sentence) if c):
+        if len(clause) <= max_chars:
+            pieces.append(clause)
+            continue
+        current = ""
+        for word in clause.split():
+            # A single word longer than the budget is cut hard
+            while len(word) > max_chars:
+                if current:
+                    pieces.append(current)
+                    current = ""
+                pieces.append(word[:max_chars])
+                word = word[max_chars:]
+            if not word:
+                continue
+            if current and len(_join(current, word)) > max_chars:
+                pieces.append(current)
+                current = word
+            else:
+                current = _join(current, word)
+        if current:
+            pieces.append(current)
+    return pieces
+
+
+def split_paragraph(text, max_chars=250):
+    """Pack whole sentences into chunks of at most max_chars characters"""
+    text = " ".join(text.split())
+    chunks, current = [], ""
+
+    for sentence in split_sentences(text):
+        pieces = [sentence] if len(sentence) <= max_chars else _split_long(sentence, max_chars)
+        for piece in pieces:
+            if current and len(_join(current, piece)) > max_chars:
+                chunks.append(current)
+                current = piece
+            else:
+                current = _join(current, piece)
+
+    if current:
+        chunks.append(current)
+
+    return chunks
+
+
+def plan_chunks(text, max_chars=250, extension="wav"):
+    """List every chunk of every paragraph with its paragraph/part metadata"""
+    planned = []
+    for para_num, para_text in extract_paragraphs(text):
+        chunks = split_paragraph(para_text, max_chars)
+
+        for part_idx, chunk in enumerate(chunks, start=1):
+            if len(chunks) > 1:
+                file_name = f"Paragraph_{para_num}_part_{part_idx}.{extension}"
+            else:
+                file_name = f"Paragraph_{para_num}.{extension}"
+            planned.append({
+                "paragraph": int(para_num),
+                "part": part_idx,
+                "parts": len(chunks),
+                "file_name": file_name,
+                "text": chunk
+            })
+    return planned
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Geria Voice Cloning Model Snapshots
+Pre-serialized XTTS model loaded with memory-mapped weights for fast cold starts
+"""
+
+import hashlib
+import os
+import time
+
+import torch
+
+from pipeline import get_xtts
+
+
+def snapshot_path(snapshot_dir, model_name):
+    """Snapshot file for this model, TTS release and torch build"""
+    from TTS import __version__ as tts_version
+
+    version = f"{model_name}@{tts_version}/torch-{torch.__version__}"
+    digest = hashlib.sha256(version.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(snapshot_dir, f"xtts-{digest}.pt")
+
+
+def write_snapshot(xtts, path):
+    """Serialize the whole model (structure, tokenizer and weights) to path"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        torch.save(xtts, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_snapshot(path):
+    """Load a snapshot with its tensors mapped from the file instead of copied
+
+    Pages are private copy-on-write mappings of the page cache, so processes
+    loading the same snapshot share physical memory for the weights. The file
+    holds a pickled model, so only load snapshots this service wrote itself.
+    """
+    xtts = torch.load(path, map_location="cpu", mmap=True, weights_only=False)
+    xtts.eval()
+    return xtts
+
+
+def load_xtts(model_name, snapshot_dir=None):
+    """Return (Xtts model, source), preferring a snapshot in snapshot_dir
+
+    Without a usable snapshot the model is built from its checkpoint as usual
+    and, when snapshot_dir is set, a snapshot is written for the next start.
+    """
+    path = snapshot_path(snapshot_dir, model_name) if snapshot_dir else None
+
+    if path and os.path.exists(path):
+        try:
+            return load_snapshot(path), "snapshot"
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable model snapshot {path}: {str(e)}")
+
+    from TTS.api import TTS
+
+    xtts = get_xtts(TTS(model_name).to("cpu"))
+
+    if path:
+        started = time.perf_counter()
+        try:
+            write_snapshot(xtts, path)
+            print(f"💾 Wrote model snapshot {path} in {time.perf_counter() - started:.1f}s")
+        except Exception as e:
+            print(f"⚠️ Could not write model snapshot: {str(e)}")
+
+    return xtts, "checkpoint"
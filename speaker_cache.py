@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Geria Voice Cloning Speaker Cache
+Keeps XTTS conditioning latents keyed by a hash of the speaker audio
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import torch
+
+
+def hash_speaker_files(speaker_paths):
+    """Hash the contents of the speaker files, in order"""
+    digest = hashlib.sha256()
+    for path in speaker_paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        # Separator so [ab, c] and [a, bc] hash differently
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _latents_nbytes(latents):
+    """Memory used by a (gpt_cond_latent, speaker_embedding) pair"""
+    return sum(t.element_size() * t.nelement() for t in latents)
+
+
+class SpeakerLatentCache:
+    """LRU cache of conditioning latents bounded by a memory budget"""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, cache_dir=None):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pt")
+
+    def _store(self, key, latents):
+        """Insert latents and evict least recently used entries over budget"""
+        size = _latents_nbytes(latents)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            self._entries[key] = (latents, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[0]
+        return None
+
+    def _load_from_disk(self, key):
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            data = torch.load(path, map_location="cpu")
+            return data["gpt_cond_latent"], data["speaker_embedding"]
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable speaker cache entry {path}: {str(e)}")
+            return None
+
+    def _save_to_disk(self, key, latents):
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.tmp"
+        try:
+            torch.save(
+                {"gpt_cond_latent": latents[0], "speaker_embedding": latents[1]},
+                tmp_path
+            )
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"⚠️ Could not persist speaker latents: {str(e)}")
+
+    def get_latents(self, xtts, speaker_paths, key=None):
+        """Return (gpt_cond_latent, speaker_embedding) for the speaker files"""
+        if key is None:
+            key = hash_speaker_files(speaker_paths)
+
+        latents = self._lookup(key)
+        if latents is not None:
+            self.hits += 1
+            return latents
+
+        latents = self._load_from_disk(key)
+        if latents is None:
+            self.misses += 1
+            config = xtts.config
+            with torch.inference_mode():
+                latents = xtts.get_conditioning_latents(
+                    audio_path=list(speaker_paths),
+                    gpt_cond_len=config.gpt_cond_len,
+                    gpt_cond_chunk_len=config.gpt_cond_chunk_len,
+                    max_ref_length=config.max_ref_len,
+                    sound_norm_refs=config.sound_norm_refs,
+                )
+            self._save_to_disk(key, latents)
+        else:
+            self.hits += 1
+
+        self._store(key, latents)
+        return latents
+
+    def stats(self):
+        """Cache counters for status reporting"""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "persistent": bool(self.cache_dir),
+        }
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Geria Voice Cloning Speaker Preprocessing
+Turns uploaded reference audio into compact mono clips at the conditioning rate
+"""
+
+import os
+from math import gcd
+
+import numpy as np
+import soundfile as sf
+from scipy.signal import resample_poly
+
+FRAME_SECONDS = 0.02
+# Frames quieter than this relative to the loudest frame count as silence
+SILENCE_DB = -40.0
+# Absolute floor so near-silent files are not amplified noise
+SILENCE_FLOOR = 1e-4
+# Silence kept around the speech so onsets and decays are not clipped
+PAD_FRAMES = 5
+PEAK_DBFS = -1.0
+
+
+class NoSpeechError(ValueError):
+    """Raised when a speaker file holds nothing above the silence threshold"""
+
+
+def to_mono(audio):
+    """Average the channels of a (frames, channels) array"""
+    return audio.mean(axis=1) if audio.ndim == 2 else audio
+
+
+def resample(audio, sample_rate, target_rate):
+    """Polyphase resampling between integer rates"""
+    if sample_rate == target_rate:
+        return audio
+    divisor = gcd(sample_rate, target_rate)
+    return resample_poly(audio, target_rate // divisor, sample_rate // divisor).astype(np.float32)
+
+
+def frame_rms(audio, frame):
+    """RMS of each whole frame of audio"""
+    count = len(audio) // frame
+    frames = audio[:count * frame].reshape(count, frame)
+    return np.sqrt(np.mean(frames * frames, axis=1))
+
+
+def trim_silence(audio, sample_rate):
+    """(trimmed audio, RMS of its active frames) without leading and trailing silence"""
+    frame = max(1, int(sample_rate * FRAME_SECONDS))
+    rms = frame_rms(audio, frame)
+    if not rms.size:
+        raise NoSpeechError("Speaker file is too short")
+
+    active = rms > max(rms.max() * 10 ** (SILENCE_DB / 20), SILENCE_FLOOR)
+    if not active.any():
+        raise NoSpeechError("No speech found in speaker file")
+
+    indices = np.flatnonzero(active)
+    first = max(0, indices[0] - PAD_FRAMES)
+    last = min(len(rms), indices[-1] + 1 + PAD_FRAMES)
+    return audio[first * frame:last * frame], rms[active]
+
+
+def normalize_loudness(audio, active_rms, target_dbfs):
+    """Scale speech RMS to target_dbfs, limited so peaks stay under PEAK_DBFS"""
+    if not audio.size:
+        raise NoSpeechError("No speech left in speaker file")
+    speech_rms = np.sqrt(np.mean(active_rms * active_rms))
+    gain = 10 ** (target_dbfs / 20) / speech_rms
+    peak = np.abs(audio).max()
+    gain = min(gain, 10 ** (PEAK_DBFS / 20) / peak)
+    return (audio * gain).astype(np.float32)
+
+
+def preprocess_speaker(path, sample_rate, max_samples=None, target_dbfs=-20.0):
+    """Decoded, mono, resampled, trimmed and normalized samples of one speaker file"""
+    audio, source_rate = sf.read(path, dtype="float32", always_2d=True)
+    audio = resample(to_mono(audio), source_rate, sample_rate)
+    audio, active_rms = trim_silence(audio, sample_rate)
+    if max_samples is not None:
+        audio = audio[:max_samples]
+    return normalize_loudness(audio, active_rms, target_dbfs)
+
+
+def preprocess_speakers(speaker_paths, sample_rate, max_seconds=30.0, target_dbfs=-20.0):
+    """Replace uploads with canonical 16-bit mono WAVs sharing max_seconds of reference audio
+
+    Files past the duration budget are dropped. Returns the canonical paths
+    and a summary of the bytes and seconds before and after.
+    """
+    canonical = []
+    # Budget counted in samples so no rounding remainder is left over
+    remaining = int(max_seconds * sample_rate) if max_seconds is not None else None
+    min_samples = max(1, int(sample_rate * FRAME_SECONDS))
+    bytes_in = bytes_out = 0
+    for path in speaker_paths:
+        bytes_in += os.path.getsize(path)
+        if remaining is not None and remaining < min_samples:
+            os.remove(path)
+            continue
+
+        audio = preprocess_speaker(path, sample_rate, remaining, target_dbfs)
+        stem = os.path.splitext(path)[0]
+        tmp_path = f"{stem}.tmp"
+        sf.write(tmp_path, audio, sample_rate, format="WAV", subtype="PCM_16")
+        os.replace(tmp_path, f"{stem}.wav")
+        if path != f"{stem}.wav":
+            os.remove(path)
+
+        canonical.append(f"{stem}.wav")
+        bytes_out += os.path.getsize(f"{stem}.wav")
+        if remaining is not None:
+            remaining -= len(audio)
+
+    if not canonical:
+        raise NoSpeechError("No speech found in speaker files")
+
+    seconds = sum(sf.info(path).duration for path in canonical)
+    return canonical, {"bytes_in": bytes_in, "bytes_out": bytes_out, "seconds": round(seconds, 3)}
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Geria Voice Cloning Thread Sweep
+Finds the inference worker / torch thread split with the best throughput on this host
+
+Usage:
+    python sweep_threads.py
+    python sweep_threads.py --workers 1 2 4 --threads 2 4 8 --pin --chunks 16
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from cpu_tuning import available_cpus, split_cpus
+
+MODEL_NAME = "tts_models/multilingual/multi-dataset/xtts_v2"
+DEFAULT_SPEAKER = str(Path(__file__).parent / "samples" / "en_sample.wav")
+DEFAULT_TEXT = (
+    "The quick brown fox jumps over the lazy dog, "
+    "while the voice cloning service keeps every core busy."
+)
+
+
+def candidate_layouts(cores, workers=None, threads=None):
+    """(workers, threads per worker) pairs that fit in the available cores"""
+    if not workers:
+        workers, w = [], 1
+        while w <= cores:
+            workers.append(w)
+            w *= 2
+    layouts = []
+    for w in workers:
+        for t in threads or [max(1, cores // w)]:
+            if w * t <= cores:
+                layouts.append((w, t))
+    return layouts
+
+
+def measure(xtts, latents, workers, threads, pin, chunks, text, language):
+    """Throughput of one layout: pre-forked workers fed concurrently like the backend"""
+    from pipeline import output_sample_rate
+    from prefork import PreforkPool
+
+    cpu_sets = split_cpus(available_cpus(), workers) if pin else None
+    pool = PreforkPool(workers, threads_per_worker=threads, cpu_sets=cpu_sets)
+    pool.start({"fp32": xtts})
+    sample_rate = output_sample_rate(xtts)
+
+    def one(_):
+        started = time.perf_counter()
+        wav = pool.synthesize(text, latents, language=language)
+        return time.perf_counter() - started, len(wav) / sample_rate
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as callers:
+            # One untimed call per worker pays the warm-up costs
+            list(callers.map(one, range(workers)))
+            started = time.perf_counter()
+            timings = list(callers.map(one, range(chunks)))
+            wall = time.perf_counter() - started
+    finally:
+        pool.close()
+
+    audio_seconds = sum(audio for _, audio in timings)
+    return {
+        "workers": workers,
+        "threads_per_worker": threads,
+        "pinned": bool(cpu_sets),
+        "wall_seconds": round(wall, 3),
+        "audio_seconds_per_second": round(audio_seconds / wall, 3),
+        "latency_mean_seconds": round(sum(latency for latency, _ in timings) / len(timings), 3),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep inference workers x torch threads for throughput")
+    parser.add_argument("--workers", type=int, nargs="+", help="Worker counts (default: powers of two)")
+    parser.add_argument("--threads", type=int, nargs="+", help="Threads per worker (default: cores / workers)")
+    parser.add_argument("--pin", action="store_true", help="Pin each worker to its own cores")
+    parser.add_argument("--chunks", type=int, default=8, help="Chunks synthesized per layout (default: 8)")
+    parser.add_argument("--speaker", default=DEFAULT_SPEAKER, help="Reference WAV")
+    parser.add_argument("--language", default="en", help="Language code (default: en)")
+    parser.add_argument("--text", default=DEFAULT_TEXT, help="Text of every chunk")
+    parser.add_argument("--output", default=None, help="Write the JSON results here")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    from snapshot import load_xtts
+
+    args = parse_args(argv)
+    cores = len(available_cpus())
+    layouts = candidate_layouts(cores, args.workers, args.threads)
+    if not layouts:
+        print(f"❌ No layout fits in {cores} cores")
+        return 1
+
+    print("🔄 Loading TTS model...")
+    xtts, _ = load_xtts(MODEL_NAME, os.getenv("MODEL_SNAPSHOT_DIR") or None)
+    latents = xtts.get_conditioning_latents(audio_path=[args.speaker])
+
+    results = []
+    for workers, threads in layouts:
+        print(f"⏱️ {workers} worker(s) x {threads} thread(s)...")
+        result = measure(xtts, latents, workers, threads, args.pin, args.chunks, args.text, args.language)
+        results.append(result)
+        print(f"   {result['audio_seconds_per_second']} audio s/s, "
+              f"{result['latency_mean_seconds']}s mean latency per chunk")
+
+    best = max(results, key=lambda r: r["audio_seconds_per_second"])
+    print(f"✅ Best on {cores} cores: {best['workers']} worker(s) x {best['threads_per_worker']} thread(s)")
+    print(f"   INFERENCE_PROCESSES={best['workers']} WORKER_THREADS={best['threads_per_worker']}"
+          f"{' PIN_WORKERS=1' if best['pinned'] else ''}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"cores": cores, "results": results, "best": best}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,10 @@ Tests if all required dependencies are properly installed
 
 import sys
 import importlib
+import glob
+import os
+import shutil
+import tempfile
 
 def test_import(module_name, package_name=None):
     """Test if a module can be imported"""
@@ -17,6 +21,34 @@ def test_import(module_name, package_name=None):
         print(f"❌ {package_name or module_name}: {e}")
         return False
 
+def test_speaker_preprocessing():
+    """Preprocess the bundled Arabella samples like an upload of all five"""
+    try:
+        from speaker_prep import preprocess_speakers
+    except ImportError as e:
+        print(f"❌ Speaker preprocessing: {e}")
+        return False
+    
+    samples = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "Arabella*.wav")))
+    if not samples:
+        print("⚠️ Speaker preprocessing: no Arabella*.wav samples found, skipped")
+        return True
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [shutil.copy(sample, tmp) for sample in samples]
+        try:
+            canonical, summary = preprocess_speakers(paths, 22050, max_seconds=30.0)
+        except Exception as e:
+            print(f"❌ Speaker preprocessing: {e}")
+            return False
+    
+    if not canonical or summary["seconds"] > 30.0:
+        print(f"❌ Speaker preprocessing: unexpected result {summary}")
+        return False
+    print(f"✅ Speaker preprocessing ({len(samples)} files -> {len(canonical)} clips, "
+          f"{summary['seconds']}s, {summary['bytes_in']} -> {summary['bytes_out']} bytes)")
+    return True
+
 def main():
     print("🧪 Testing Geria Voice Cloning Dependencies...\n")
     
@@ -65,6 +97,10 @@ def main():
     for module, name in text_deps:
         test_import(module, name)
     
+    print("\n🎙️ Testing Speaker Preprocessing:")
+    if not test_speaker_preprocessing():
+        all_passed = False
+    
     print(f"\n{'🎉 All tests passed!' if all_passed else '❌ Some dependencies failed'}")
     
     if all_passed:
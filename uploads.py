@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Geria Voice Cloning Uploads
+Request body limits and block-wise copies of speaker uploads into job directories
+"""
+
+import hashlib
+import os
+
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+
+BLOCK_SIZE = 1024 * 1024
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds its per-file or per-request byte limit"""
+
+
+class InvalidAudioError(Exception):
+    """Raised when an upload does not start with a supported audio header"""
+
+
+def sniff_audio_format(head):
+    """Audio format ("wav", "flac", "ogg" or "mp3") from a file's first bytes, or None"""
+    if len(head) >= 12 and head[:4] in (b"RIFF", b"RF64") and head[8:12] == b"WAVE":
+        return "wav"
+    if head[:4] == b"fLaC":
+        return "flac"
+    if head[:4] == b"OggS":
+        return "ogg"
+    # ID3-tagged MP3, or a bare MPEG audio frame sync
+    if head[:3] == b"ID3" or (len(head) >= 2 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+        return "mp3"
+    return None
+
+
+class BodySizeLimitMiddleware:
+    """ASGI middleware that answers 413 once a request body passes max_bytes
+
+    A declared Content-Length over the limit is refused before anything is
+    read. Otherwise the bytes are counted as the body streams in, chunked
+    bodies included, so an oversized upload is cut off mid-transfer instead
+    of being parsed and spooled in full.
+    """
+
+    def __init__(self, app, max_bytes):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    def _too_large(self):
+        return HTTPException(status_code=413, detail=f"Request body larger than {self.max_bytes} bytes")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        length = dict(scope["headers"]).get(b"content-length", b"")
+        if length.isdigit() and int(length) > self.max_bytes:
+            error = self._too_large()
+            response = JSONResponse(status_code=error.status_code, content={"detail": error.detail})
+            return await response(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Raised inside form parsing; FastAPI re-raises it as the response
+                    raise self._too_large()
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+async def hash_uploads(uploads, block_size=BLOCK_SIZE):
+    """SHA-256 over the contents of parsed UploadFiles, rewinding each one afterwards"""
+    digest = hashlib.sha256()
+    for upload in uploads:
+        block = await upload.read(block_size)
+        while block:
+            digest.update(block)
+            block = await upload.read(block_size)
+        await upload.seek(0)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+async def spool_upload(upload, path_stem, max_bytes, block_size=BLOCK_SIZE):
+    """Copy a parsed UploadFile to path_stem + its detected extension, one block at a time
+
+    The multipart parser has already spooled the body (bounded by
+    BodySizeLimitMiddleware); this copy checks the header on the first block
+    and the size after every block so it never holds a whole file in memory.
+    Returns (path, bytes written); a partially written file is removed on error.
+    """
+    if upload.size is not None and upload.size > max_bytes:
+        raise UploadTooLargeError(f"{upload.filename} is larger than {max_bytes} bytes")
+
+    block = await upload.read(block_size)
+    audio_format = sniff_audio_format(block)
+    if audio_format is None:
+        raise InvalidAudioError(f"{upload.filename} is not a WAV, FLAC, OGG or MP3 file")
+
+    path = f"{path_stem}.{audio_format}"
+    written = 0
+    try:
+        with open(path, "wb") as f:
+            while block:
+                written += len(block)
+                if written > max_bytes:
+                    raise UploadTooLargeError(f"{upload.filename} is larger than {max_bytes} bytes")
+                f.write(block)
+                block = await upload.read(block_size)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path, written